@@ -1,14 +1,48 @@
 from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING
+
 # monkey must come first as it does some patching, hence the name...
 from . import monkey
-from .collector import DistCollector
 from .const import SERIAL
-from .distribution import BaseDistribution, Distribution
-from .requirement import BaseRequirement, Requirement
-from .requires import Requires
-from .util import dump, dumps, load, loads
 
-from_path = DistCollector.from_path
+if TYPE_CHECKING:
+    from .collector import DistCollector
+    from .distribution import BaseDistribution, Distribution
+    from .requirement import BaseRequirement, Requirement
+    from .requires import Requires
+    from .util import dump, dumps, load, loads
+
+    from_path = DistCollector.from_path
 
 del monkey
+
+# public attributes are imported on first access (PEP 562) so that users who only need
+# e.g. `Requirement` don't pay for importing every collector
+LAZY_ATTRS = dict(
+    DistCollector="collector",
+    BaseDistribution="distribution",
+    Distribution="distribution",
+    BaseRequirement="requirement",
+    Requirement="requirement",
+    Requires="requires",
+    dump="util",
+    dumps="util",
+    load="util",
+    loads="util",
+)
+
+
+def __getattr__(name: str) -> object:
+    if name == "from_path":
+        value = __getattr__("DistCollector").from_path
+    elif (module := LAZY_ATTRS.get(name)) is not None:
+        value = getattr(importlib.import_module(f".{module}", __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+__all__ = ["SERIAL", "from_path", *LAZY_ATTRS]
@@ -4,7 +4,7 @@ import contextlib
 import dataclasses
 import functools
 import logging
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, ClassVar, cast
 
 from . import util
 
@@ -36,9 +36,23 @@ class SelfLogger:
     def factory(cls, obj: Base | str) -> SelfLogger:
         return cls(obj=obj, _logger=logging.getLogger(type(obj).__module__))
 
+    def isEnabledFor(self, level: int) -> bool:  # noqa: N802
+        return self._logger.isEnabledFor(level)
+
     def _log(
-        self, level: str, msg: str, *args: Any, noself: bool = False, **kwargs: Any
+        self,
+        level: str,
+        msg: Callable[[], str] | str,
+        *args: Any,
+        noself: bool = False,
+        **kwargs: Any,
     ) -> None:
+        # nothing is formatted unless the level is enabled, pass a callable as `msg`
+        # to defer building costly messages too
+        if not self._logger.isEnabledFor(util.levelno(level)):
+            return
+        if callable(msg):
+            msg = msg()
         kwargs.setdefault("stacklevel", 3)
         obj_repr = isinstance(self.obj, str) and self.obj or repr(self.obj)
         getattr(self._logger, level)(
@@ -50,16 +64,48 @@ class SelfLogger:
 
     @contextlib.contextmanager
     def duration(
-        self, msg: str, *args: Any, **kwargs: Any
+        self, msg: Callable[[], str] | str, *args: Any, **kwargs: Any
     ) -> Generator[None, None, None]:
         with util.log_duration(msg, *args, logger=cast(logging.Logger, self), **kwargs):
             yield
 
 
 class Base:
+    # cache str and hash in the instance dict, for implementers whose rendering is
+    # costly, the cache is dropped on attribute assignment (which includes augmented
+    # assignment in `__iand__`) and `replace` returns a new instance - values must not
+    # change in place so sets are held frozen and nested implementers are replaced
+    # rather than mutated
+    CACHE_STR: ClassVar[bool] = False
+
+    def __str__(self) -> str:
+        if not self.CACHE_STR:
+            return super().__str__()
+        return self._cached("_str", super().__str__)
+
     def __hash__(self) -> int:
+        if not self.CACHE_STR:
+            return self._hash()
+        return self._cached("_hash", self._hash)
+
+    def _hash(self) -> int:
         return hash(self.__class__.__name__ + str(self))
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self.CACHE_STR:
+            if self.__dict__:
+                self.__dict__.clear()
+            if isinstance(value, set):
+                value = frozenset(value)
+        super().__setattr__(name, value)
+
+    def _cached(self, key: str, func: Callable[[], Any]) -> Any:
+        try:
+            return self.__dict__[key]
+        except KeyError:
+            value = self.__dict__[key] = func()
+            return value
+
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, str):
             other = str(other)
@@ -1,21 +1,43 @@
 from __future__ import annotations
 
 import sys
-import traceback
-from types import TracebackType
+from typing import IO
 
 import anyio
 import click
 from box import Box
 
 from . import const, logconfig, util
-from .collector import DistCollector
+from .collector import DirtyCollector, DistCollector
+from .distribution import Distribution
 
 
 def main() -> None:
     _main(auto_envvar_prefix=const.ENVVAR_PREFIX)
 
 
+def _timeouts(
+    _ctx: click.Context, param: click.Parameter, values: tuple[str, ...]
+) -> dict[str, float | None] | None:
+    timeouts: dict[str, float | None] = {}
+    names = {
+        collector.__name__
+        for collector in DistCollector.COLLECTORS
+        if issubclass(collector, DirtyCollector)
+    }
+    for value in values:
+        name, _, seconds = value.partition(":")
+        if name not in names:
+            raise click.BadParameter(f"unknown dirty collector {name!r}", param=param)
+        try:
+            timeouts[name] = float(seconds) or None
+        except ValueError:
+            raise click.BadParameter(
+                f"invalid seconds {seconds!r}", param=param
+            ) from None
+    return timeouts or None
+
+
 @click.command(context_settings=dict(show_default=True))
 @click.argument(
     "path",
@@ -40,6 +62,12 @@ def main() -> None:
     default=util.DEFAULT_DUMPER,
     help="Output format.",
 )
+@click.option(
+    "--sort/--no-sort",
+    default=None,
+    show_default="sorted for json and yaml",
+    help="Sort output.",
+)
 @click.option(
     "-i", "--include", multiple=True, help="Include metadata key. Multiple supported."
 )
@@ -66,8 +94,48 @@ def main() -> None:
     show_choices=True,
     help="Log color.",
 )
-# private option used by dirty collectors to call themselves in a subprocess
-@click.option("--collector", hidden=True)
+@click.option(
+    "--lossy-log",
+    is_flag=True,
+    help="Drop log records below info instead of blocking when logging falls behind.",
+)
+@click.option(
+    "--max-subprocesses",
+    type=click.IntRange(min=1),
+    show_default="from cpus",
+    help="Maximum concurrent subprocesses.",
+)
+@click.option(
+    "--max-dirty",
+    type=click.IntRange(min=1),
+    show_default="from cpus and memory",
+    help="Maximum concurrent dirty collector executions.",
+)
+@click.option(
+    "--max-threads",
+    type=click.IntRange(min=1),
+    show_default="from cpus",
+    help="Maximum concurrent threads.",
+)
+@click.option(
+    "--deadline",
+    type=click.FloatRange(min=0, min_open=True),
+    show_default="none",
+    help="Seconds to collect for, then return what has been collected.",
+)
+@click.option(
+    "--timeout",
+    "timeouts",
+    multiple=True,
+    callback=_timeouts,
+    metavar="COLLECTOR:SECONDS",
+    help="Dirty collector timeout, 0 for none. Multiple supported.",
+)
+@click.option(
+    "--explain",
+    is_flag=True,
+    help="Print the collectors to run and those each runs after, then exit.",
+)
 # developer options
 @click.option("-d", "--debug", is_flag=True, hidden=True)
 @click.option("-p", "--pdb", is_flag=True, hidden=True)
@@ -87,14 +155,20 @@ def _main(path: click.Path, **params: dict) -> None:
     )
 
 
+def _stdout(fmt: str) -> IO:
+    # binary formats write bytes so need a buffer, looked up when dumping since
+    # collectors running in-process replace sys.stdout
+    return sys.stdout.buffer if fmt in util.BINARY_FORMATS else sys.stdout
+
+
 async def _async_main(path: click.Path, options: Box) -> None:
     try:
         # configure logging
-        log_buffer = await logconfig.configure(
+        await logconfig.configure(
             debug=options.debug,
             verbosity=options.verbose,
-            buffer=options.collector is not None,
             color=options.color,
+            lossy=options.lossy_log,
         )
 
         # Distribution kwargs
@@ -116,40 +190,33 @@ async def _async_main(path: click.Path, options: Box) -> None:
                 attr = {key: attr}
             kwargs.update(attr)
 
-        # run all collectors
-        if options.collector is None:
-            dist = await DistCollector.from_path(path, **kwargs)
-
-        # run single collector
-        else:
-            dist = await DistCollector.from_dir(
-                path,
-                files=util.load(sys.stdin.buffer, fmt="msgpack"),
-                collector=options.collector,
-                **kwargs,
+        if options.explain:
+            # collectors producing no included key are pruned
+            dist = await Distribution.factory(
+                _include=options.include, _exclude=options.exclude
             )
-            dist.ext.log = [
+            util.dump(
                 {
-                    # args may be objects so replace with repr
-                    k: [
-                        traceback.format_tb(v)
-                        if isinstance(v, TracebackType)
-                        else repr(v)
-                        for v in v
-                    ]
-                    if k in ("args", "exc_info") and v is not None
-                    else v
-                    for k, v in record.__dict__.items()
-                }
-                for record in log_buffer.buffer
-            ]
+                    collector.__name__: [before.__name__ for before in befores]
+                    for collector, befores in DistCollector.plan(dist).items()
+                },
+                file=_stdout(options.format),
+                fmt=options.format,
+                clean=False,
+                sort=False,
+            )
+            return
+
+        # run all collectors
+        dist = await DistCollector.from_path(path, **kwargs)
 
         # dump to stdout
         util.dump(
             dist.to_dict(core_metadata=options.core_metadata),
-            # msgpack writes bytes so needs a buffer
-            file=sys.stdout.buffer if options.format == "msgpack" else sys.stdout,
+            file=_stdout(options.format),
             fmt=options.format,
+            clean=False,
+            sort=options.sort,
         )
 
     # pdb post-mortem
@@ -158,3 +225,6 @@ async def _async_main(path: click.Path, options: Box) -> None:
             raise
         print(exc, file=sys.stderr)  # noqa: T201
         __import__("pdb").post_mortem(exc.__traceback__)
+
+    finally:
+        logconfig.shutdown()
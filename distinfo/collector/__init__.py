@@ -1,17 +1,49 @@
 from __future__ import annotations
 
-import functools
+import importlib
+from typing import TYPE_CHECKING
 
-from .cargo import Cargo
-from .collector import Collector, CollectorMixin
-from .distcollector import DistCollector
-from .findpkgs import FindPkgs
-from .findtests import FindTests
-from .metadata import (
-    DirtyCollector,
-    MetadataCollector,
-    PathMetadata,
-    PyProjectDynamicMetadata,
-    PyProjectMetadata,
-    SetuptoolsMetadata,
+if TYPE_CHECKING:
+    from .cargo import Cargo
+    from .collector import Collector, CollectorMixin
+    from .distcollector import DistCollector
+    from .fileindex import FileIndex
+    from .findpkgs import FindPkgs
+    from .findtests import FindTests
+    from .metadata import (
+        DirtyCollector,
+        MetadataCollector,
+        PathMetadata,
+        PyProjectDynamicMetadata,
+        PyProjectMetadata,
+        SetuptoolsMetadata,
+    )
+
+# collectors are imported on first access (PEP 562), see `distinfo.__getattr__`
+LAZY_ATTRS = dict(
+    Cargo="cargo",
+    Collector="collector",
+    CollectorMixin="collector",
+    DistCollector="distcollector",
+    FileIndex="fileindex",
+    FindPkgs="findpkgs",
+    FindTests="findtests",
+    DirtyCollector="metadata",
+    MetadataCollector="metadata",
+    PathMetadata="metadata",
+    PyProjectDynamicMetadata="metadata",
+    PyProjectMetadata="metadata",
+    SetuptoolsMetadata="metadata",
 )
+
+
+def __getattr__(name: str) -> object:
+    if (module := LAZY_ATTRS.get(name)) is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = globals()[name] = getattr(
+        importlib.import_module(f".{module}", __name__), name
+    )
+    return value
+
+
+__all__ = list(LAZY_ATTRS)
@@ -11,8 +11,13 @@ from .collector import Collector
 
 @dataclasses.dataclass(**DATACLASS_DEFAULTS)
 class Cargo(Collector):
+    PRODUCES: ClassVar[frozenset[str]] = frozenset(("ext.cargo",))
+
     CARGO_LOCK: ClassVar[str] = "Cargo.lock"
 
+    async def wanted(self) -> bool:
+        return self.dist.ext.get("format") != "wheel"
+
     async def _collect(self) -> bool:
         for path in self.sorted_files:
             if path.endswith(self.CARGO_LOCK):
@@ -29,6 +29,28 @@ class CollectorMixin:
 
 @dataclasses.dataclass(**DATACLASS_DEFAULTS)
 class Collector(CollectorMixin, Base):
+    # `Distribution` keys this may set and read, `ext` keys as "ext.<key>"
+    PRODUCES: ClassVar[frozenset[str]] = frozenset()
+
+    # consumed keys are optional inputs, a collector planned for the keys it produces
+    # doesn't keep those that produce only keys it consumes
+    CONSUMES: ClassVar[frozenset[str]] = frozenset()
+
+    # a collector runs after those of lower priority that produce keys it produces or
+    # consumes, values aren't overwritten so the first to produce a key takes
+    # precedence
+    PRIORITY: ClassVar[int] = 0
+
+    # rough cost of collecting: 0 reads listed files, 1 parses or imports in-process, 2
+    # runs a build backend or setup.py - all but 0 are cut off at the deadline
+    COST: ClassVar[int] = 0
+
+    # wait for the complete file listing before collecting
+    NEEDS_FILES: ClassVar[bool] = True
+
+    # set as ext.format, if not already set, when run
+    FORMAT: ClassVar[str | None] = None
+
     collector: DistCollector
 
     result: bool | None = None
@@ -37,10 +59,16 @@ class Collector(CollectorMixin, Base):
     def exists(self) -> bool:
         raise NotImplementedError
 
+    async def wanted(self) -> bool:
+        """Whether to run, called once the collectors this runs after are done"""
+        return True
+
     def __getattr__(self, key: str) -> Any:
         return getattr(self.collector, key)
 
     async def __call__(self) -> bool:
+        if self.NEEDS_FILES:
+            await self.index.wait()
         with self.log.duration(
             "collecting...",
             lambda: self.result and "success" or "failure",
@@ -72,7 +100,7 @@ class Collector(CollectorMixin, Base):
                 ]:
                     modules.add(module)
             if modules:  # pragma: no branch
-                self.log.debug(f"set modules: {util.irepr(modules, repr=str)}")
+                self.log.debug(lambda: f"set modules: {util.irepr(modules, repr=str)}")
                 self.dist.ext.setdefault("modules", set()).update(modules)
         # packages
         if dist.packages:
@@ -96,7 +124,7 @@ class Collector(CollectorMixin, Base):
                 else:
                     packages.remove(package)
         if packages:
-            self.log.debug(f"set packages: {util.irepr(packages, repr=str)}")
+            self.log.debug(lambda: f"set packages: {util.irepr(packages, repr=str)}")
             self.dist.ext.setdefault("packages", set()).update(packages)
 
     PACKAGE_IGNORE: ClassVar[tuple[str, ...]] = (
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import contextlib
 import dataclasses
+import math
 import os
+import re
 import subprocess
 from typing import TYPE_CHECKING, ClassVar, overload
 
@@ -10,11 +12,12 @@ import anyio
 import deepmerge
 from box import Box
 
-from .. import command, const, util
+from .. import command, const, limits, monkey, util
 from ..base import DATACLASS_DEFAULTS, Base
 from ..distribution import Distribution
 from .cargo import Cargo
 from .collector import Collector, CollectorMixin
+from .fileindex import FileIndex
 from .findpkgs import FindPkgs
 from .findtests import FindTests
 from .metadata import (
@@ -26,7 +29,7 @@ from .metadata import (
 )
 
 if TYPE_CHECKING:
-    from typing import Literal
+    from typing import Any, Literal
 
     from ..distribution import BaseDistribution, DistributionKeyType
 
@@ -41,6 +44,15 @@ class DistCollector(CollectorMixin, Base):
         modify_globals=False,
         evaluate=False,
         verbose=0,
+        # process-wide `limits`, None keeps the current limit
+        max_subprocesses=None,
+        max_dirty=None,
+        max_threads=None,
+        # seconds from_path may take, then collectors still running are cut off
+        deadline=None,
+        # dirty collector class name to seconds its subprocess may run, overriding
+        # `DirtyCollector.TIMEOUT`
+        timeouts=None,
     )
 
     TAR_ARCHIVES: ClassVar[tuple[str, ...]] = (".tar.bz2", ".tar.gz", ".tar.xz")
@@ -49,14 +61,36 @@ class DistCollector(CollectorMixin, Base):
 
     ARCHIVES: ClassVar[tuple[str, ...]] = (*TAR_ARCHIVES, *ZIP_ARCHIVES)
 
+    # ext.collectors value for a collector cut off at the deadline
+    DEADLINE: ClassVar[str] = "deadline"
+
+    # run in the order `plan` derives from their declared keys and priority
+    COLLECTORS: ClassVar[tuple[type[Collector], ...]] = (
+        Cargo,
+        FindPkgs,
+        FindTests,
+        PathMetadata,
+        PyProjectDynamicMetadata,
+        PyProjectMetadata,
+        SetuptoolsMetadata,
+    )
+
+    # matches paths that are or are under an ignored directory
+    IGNORE_PATH: ClassVar[re.Pattern] = re.compile(
+        "^({0})$|({0})/".format("|".join(map(re.escape, const.IGNORE_DIR_NAMES)))
+    )
+
     dist: BaseDistribution
 
     path: anyio.Path
 
-    files: list[str]
+    index: FileIndex
 
     options: Box
 
+    # event loop time of the deadline
+    expires: float = math.inf
+
     @classmethod
     async def from_path(
         cls,
@@ -64,6 +98,7 @@ class DistCollector(CollectorMixin, Base):
         options: DistCollectorOptionsType = None,
         **kwargs: DistributionKeyType,
     ) -> BaseDistribution:
+        started = anyio.current_time()
         if isinstance(path, str):
             path = anyio.Path(path)
         path = await path.resolve()
@@ -76,30 +111,44 @@ class DistCollector(CollectorMixin, Base):
             ) else contextlib.nullcontext() as tmpdir:
                 if path.suffix == ".whl":
                     ext.format = "wheel"
+                # source needs setuptools and pyproject_metadata so start importing
+                # them now to overlap with extracting and listing files
+                else:
+                    monkey.warmup()
+
+                if "ext" in kwargs:  # pragma: no ptest cover
+                    deepmerge.always_merger.merge(kwargs["ext"], ext)
+                else:
+                    kwargs["ext"] = ext
 
                 # extract archive
                 if isinstance(tmpdir, str):
                     # path is an archive
                     if path.name.endswith(cls.TAR_ARCHIVES):
                         try:
-                            files = await command.run(
+                            async with command.stream(
                                 "tar",
                                 f"--directory={tmpdir}",
                                 "--extract",
                                 "--verbose",
                                 "--file",
                                 path,
-                                lines=True,
-                            )
+                                batch=True,
+                            ) as batches:
+                                # "--verbose" flag lists directories as well as files
+                                # - we don't want directories
+                                files = [
+                                    path
+                                    async for lines in batches
+                                    for path in lines
+                                    if not path.endswith(os.sep)
+                                ]
                         except (
                             command.CalledProcessError
                         ) as exc:  # pragma: no ptest cover
                             if exc.returncode == 2:
                                 raise FileNotFoundError(path) from None
                             raise
-                        # "--verbose" flag lists directories as well as files - we don't
-                        # want directories
-                        files = [path for path in files if not path.endswith(os.sep)]
                     else:
                         try:
                             files = await command.run(
@@ -128,36 +177,35 @@ class DistCollector(CollectorMixin, Base):
                         prefix_length = len(prefix) + 1
                         files = [path[prefix_length:] for path in files]
                     files = await cls._filter_files(files)
-                # path is a directory
-                else:
-                    files = await cls._find_files(path)
-
-                if not files:  # pragma: no cover - error path
-                    raise FileNotFoundError(f"{path} is empty")
-                cls.clog.spam(
-                    f"files:\n{util.irepr(sorted(files), sep=os.linesep, repr=str)}"
-                )
-
-                if "ext" in kwargs:  # pragma: no ptest cover
-                    deepmerge.always_merger.merge(kwargs["ext"], ext)
-                else:
-                    kwargs["ext"] = ext
+                    cls._check_files(path, files)
+                    return await cls.from_dir(path, files, options=options, started=started, **kwargs)  # type: ignore[arg-type]
 
-                return await cls.from_dir(path, files, options=options, **kwargs)  # type: ignore[arg-type]
+                # path is a directory, collectors start while files are listed and
+                # wait on the index for the files they need
+                index = FileIndex()
+                async with anyio.create_task_group() as tg:
+                    tg.start_soon(cls._index_files, path, index)
+                    return await cls.from_dir(path, index, options=options, started=started, **kwargs)  # type: ignore[arg-type]
 
     @classmethod
     async def from_dir(
         cls,
         path: anyio.Path,
-        files: list[str],
+        files: list[str] | FileIndex,
         *,
         collector: str | None = None,
         dist_cls: type[Distribution] = Distribution,
         options: DistCollectorOptionsType = None,
+        started: float | None = None,
         **kwargs: DistributionKeyType,
     ) -> BaseDistribution:  # pragma: no utest ftest cover
         self = await cls.factory(
-            path, files, dist_cls=dist_cls, options=options, **kwargs
+            path,
+            files,
+            dist_cls=dist_cls,
+            options=options,
+            started=started,
+            **kwargs,
         )
 
         if collector is not None:
@@ -165,11 +213,7 @@ class DistCollector(CollectorMixin, Base):
             await self._collector(getattr(dirty, collector))
         else:
             # run all collectors
-            async with anyio.create_task_group() as tg:
-                tg.start_soon(self._collect_metadata)
-                tg.start_soon(self._collector, FindTests)
-                if self.dist.ext.get("format") != "wheel":
-                    tg.start_soon(self._collector, Cargo)
+            await self._collect_all()
 
         if self.options.evaluate:
             await self.dist.requires.evaluate()
@@ -180,44 +224,116 @@ class DistCollector(CollectorMixin, Base):
     async def factory(
         cls,
         path: anyio.Path,
-        files: list[str],
+        files: list[str] | FileIndex,
         *,
         dist_cls: type[Distribution] = Distribution,
         options: DistCollectorOptionsType = None,
+        started: float | None = None,
         **kwargs: DistributionKeyType,
     ) -> DistCollector:  # pragma: no utest ftest cover
         _options = cls.DEFAULT_OPTIONS.copy()
         if options is not None:  # pragma: no ptest cover
             deepmerge.always_merger.merge(_options, Box(options))
+        # limits are process-wide so are left alone unless given
+        if totals := {
+            name: total
+            for name, total in (
+                ("subprocess", _options.max_subprocesses),
+                ("dirty", _options.max_dirty),
+                ("thread", _options.max_threads),
+            )
+            if total is not None
+        }:
+            limits.configure(**totals)
         dist = await dist_cls.factory(
             _include=_options.include, _exclude=_options.exclude, **kwargs
         )
-        return cls(options=_options, dist=dist, path=path, files=files)
-
-    async def _collect_metadata(self) -> None:
-        pyproject = await self._collector(PyProjectMetadata, call=False)
-        setuptools = await self._collector(SetuptoolsMetadata, call=False)
-        # run pyproject collector(s) if pyproject.toml exists
-        if pyproject.exists:
-            pyproject_result = await pyproject()
-            # run dynamic collector if required, setuptools.build_meta is redundant
-            # since we use the setuptools collector
-            if not setuptools.exists and (
-                (not pyproject_result and "build_backend" in self.dist.ext)
-                or self.dist.dynamic
-            ):
-                await self._collector(PyProjectDynamicMetadata)
-        # run setuptools collector if setup.py and/or setup.cfg exists
-        if setuptools.exists:
-            await setuptools()
-            # format may be pyproject with setuptools.build_meta backend so don't
-            # overwrite
-            self.dist.ext.setdefault("format", "setuptools")
+        if not isinstance(files, FileIndex):
+            files = FileIndex.from_files(files)
+        self = cls(options=_options, dist=dist, path=path, index=files)
+        if _options.deadline is not None:
+            if started is None:
+                started = anyio.current_time()
+            self.expires = started + _options.deadline
+        return self
+
+    @classmethod
+    def plan(
+        cls, dist: BaseDistribution | None = None
+    ) -> dict[type[Collector], list[type[Collector]]]:
+        """Map each collector to those it runs after, ordered by priority
+
+        With `dist` collectors that produce none of the keys it includes are pruned.
+        """
+        collectors = sorted(
+            (
+                collector
+                for collector in cls.COLLECTORS
+                if dist is None
+                or any(cls._wanted(dist, key) for key in collector.PRODUCES)
+            ),
+            key=lambda c: (c.PRIORITY, c.__name__),
+        )
+        return {
+            collector: [
+                before
+                for before in collectors
+                if before.PRIORITY < collector.PRIORITY
+                and before.PRODUCES & (collector.PRODUCES | collector.CONSUMES)
+            ]
+            for collector in collectors
+        }
+
+    @staticmethod
+    def _wanted(dist: BaseDistribution, key: str) -> bool:
+        # include/exclude apply to top-level keys, "ext.<key>" is wanted with ext
+        return not dist._excluded(key.partition(".")[0])
+
+    def _filled(self, cls: type[Collector]) -> bool:
+        # whether the wanted keys cls produces are all filled by those before it
+        return all(
+            self.dist._filled(key)
+            for key in cls.PRODUCES
+            if self._wanted(self.dist, key)
+        )
+
+    async def _collect_all(self) -> None:
+        plan = self.plan(self.dist)
+        done = {collector: anyio.Event() for collector in plan}
+
+        async def run(cls: type[Collector]) -> None:
+            try:
+                for before in plan[cls]:
+                    await done[before].wait()
+                if self._filled(cls):
+                    self.log.debug(f"skip {cls.__name__}: wanted keys filled")
+                    return
+                collector = await self._collector(cls, call=False)
+                if not await collector.wanted():
+                    return
+                if cls.NEEDS_FILES:
+                    await self.index.wait()
+                # the cheapest collectors aren't cut off, they may still fill keys
+                # that those cut off didn't
+                deadline = self.expires if cls.COST else math.inf
+                if anyio.current_time() >= deadline:
+                    self.log.info(f"deadline: skip {cls.__name__}")
+                    return
+                with anyio.CancelScope(deadline=deadline) as scope:
+                    await collector()
+                    if cls.FORMAT is not None:
+                        self.dist.ext.setdefault("format", cls.FORMAT)
+                if scope.cancel_called:
+                    self.log.info(f"deadline: cut off {cls.__name__}")
+                    self.dist.ext.setdefault("collectors", Box())[
+                        cls.__name__
+                    ] = self.DEADLINE
+            finally:
+                done[cls].set()
+
         async with anyio.create_task_group() as tg:
-            tg.start_soon(self._collector, PathMetadata)
-            # run path packages collector if modules and packages not set
-            if not ("modules" in self.dist.ext or "packages" in self.dist.ext):
-                tg.start_soon(self._collector, FindPkgs)
+            for cls in plan:
+                tg.start_soon(run, cls)
 
     @overload
     async def _collector(self, cls: type[Collector]) -> bool:
@@ -243,11 +359,16 @@ class DistCollector(CollectorMixin, Base):
         return collector
 
     @classmethod
-    async def _find_files(cls, path: anyio.Path) -> list:
-        files = None
+    async def _find_files(
+        cls, path: anyio.Path, index: FileIndex | None = None
+    ) -> list[str]:
+        if index is None:
+            index = FileIndex()
+        listed = False
         if not util.is_tmpdir(path) and await (path / ".git").exists():
             try:
-                files = await command.run(
+                await cls._stream_files(
+                    index,
                     "git",
                     "-C",
                     path,
@@ -256,36 +377,63 @@ class DistCollector(CollectorMixin, Base):
                     "--exclude-standard",
                     "--others",
                     "--directory",
-                    lines=True,
+                    "-z",
                 )
+                listed = True
             except (
                 subprocess.CalledProcessError
             ) as exc:  # pragma: no cover - error path
                 if exc.returncode == 128:
                     raise FileNotFoundError(path) from None
                 cls.clog.debug(f"git files fail: {exc}")
-        if files is None:
+        if not listed:
             try:
-                files = await command.run("find", "-type", "f", lines=True, cwd=path)
+                # files are prefixed "./"
+                await cls._stream_files(
+                    index, "find", "-type", "f", "-print0", strip=2, cwd=path
+                )
             except command.CalledProcessError as exc:  # pragma: no cover - error path
                 if exc.returncode == 1:
                     raise FileNotFoundError(path) from None
                 raise
-            # files are prefixed "./"
-            files = [path[2:] for path in files]
-        return await cls._filter_files(files)
+        return index.files
 
-    @staticmethod
-    async def _filter_files(
-        files: list[str],
-    ) -> list[str]:
-        for directory in const.IGNORE_DIR_NAMES:
-            files = [
-                path
-                for path in files
-                if directory != path and f"{directory}/" not in path
-            ]
-        return files
+    @classmethod
+    async def _index_files(cls, path: anyio.Path, index: FileIndex) -> None:
+        cls._check_files(path, await cls._find_files(path, index))
+        index.close()
+
+    @classmethod
+    async def _stream_files(
+        cls,
+        index: FileIndex,
+        *args: Any,
+        strip: int = 0,
+        cwd: anyio.Path | None = None,
+    ) -> None:
+        # filter and publish as the listing is output rather than after
+        async with command.stream(*args, null=True, batch=True, cwd=cwd) as batches:
+            async for lines in batches:
+                index.add(
+                    *(path for line in lines if cls._keep_file(path := line[strip:]))
+                )
+
+    @classmethod
+    def _check_files(cls, path: anyio.Path, files: list[str]) -> None:
+        if not files:  # pragma: no cover - error path
+            raise FileNotFoundError(f"{path} is empty")
+        if cls.clog.isEnabledFor(util.levelno("spam")):
+            cls.clog.spam(
+                f"files:\n{util.irepr(sorted(files), sep=os.linesep, repr=str)}"
+            )
+
+    @classmethod
+    async def _filter_files(cls, files: list[str]) -> list[str]:
+        return [path for path in files if cls._keep_file(path)]
+
+    @classmethod
+    def _keep_file(cls, path: str) -> bool:
+        return cls.IGNORE_PATH.search(path) is None
 
     CONFTEST: ClassVar[str] = "conftest.py"
 
@@ -328,6 +476,10 @@ class DistCollector(CollectorMixin, Base):
             not in (*const.TEST_DIR_NAMES, *self.dist.ext.get("tests", []))
         ]
 
+    @property
+    def files(self) -> list[str]:
+        return self.index.files
+
     @util.cached_property
     def sorted_files(self) -> list[str]:
         return sorted(self.files, key=len)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import dataclasses
+
+import anyio
+
+from ..base import DATACLASS_DEFAULTS, Base
+
+
+@dataclasses.dataclass(**DATACLASS_DEFAULTS)
+class FileIndex(Base):
+    """Files of a source tree, published as they are listed
+
+    Listing adds files then closes the index. Collectors that need only some files can
+    wait on `has` and start as soon as those are known, others `wait` for the complete
+    listing.
+    """
+
+    files: list[str] = dataclasses.field(default_factory=list)
+
+    _paths: set[str] = dataclasses.field(default_factory=set)
+
+    _waiters: dict[str, anyio.Event] = dataclasses.field(default_factory=dict)
+
+    _complete: anyio.Event = dataclasses.field(default_factory=anyio.Event)
+
+    def __str__(self) -> str:
+        return f"{len(self.files)} files{'' if self.complete else '...'}"
+
+    @classmethod
+    def from_files(cls, files: list[str]) -> FileIndex:
+        self = cls()
+        self.add(*files)
+        self.close()
+        return self
+
+    @property
+    def complete(self) -> bool:
+        return self._complete.is_set()
+
+    def add(self, *files: str) -> None:
+        for path in files:
+            if path not in self._paths:
+                self._paths.add(path)
+                self.files.append(path)
+                if (waiter := self._waiters.pop(path, None)) is not None:
+                    waiter.set()
+
+    def close(self) -> None:
+        self._complete.set()
+        for waiter in self._waiters.values():
+            waiter.set()
+        self._waiters.clear()
+
+    async def has(self, path: str) -> bool:
+        """Whether path is listed, waits until it is or listing is complete"""
+        if path not in self._paths and not self.complete:
+            await self._waiters.setdefault(path, anyio.Event()).wait()
+        return path in self._paths
+
+    async def wait(self) -> list[str]:
+        await self._complete.wait()
+        return self.files
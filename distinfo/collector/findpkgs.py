@@ -4,10 +4,11 @@ import dataclasses
 import functools
 import os
 from fnmatch import fnmatch
+from typing import ClassVar
 
 import anyio
 
-from .. import const, monkey, util
+from .. import const, limits, monkey, util
 from ..base import DATACLASS_DEFAULTS
 from .collector import Collector
 from .findtests import FindTests
@@ -15,6 +16,20 @@ from .findtests import FindTests
 
 @dataclasses.dataclass(**DATACLASS_DEFAULTS)
 class FindPkgs(Collector):
+    PRODUCES: ClassVar[frozenset[str]] = frozenset(("ext.modules", "ext.packages"))
+
+    CONSUMES: ClassVar[frozenset[str]] = frozenset(("ext.tests",))
+
+    # runs alongside `PathMetadata`
+    PRIORITY: ClassVar[int] = 3
+
+    # setuptools discovery
+    COST: ClassVar[int] = 1
+
+    async def wanted(self) -> bool:
+        # only if no metadata collector found modules or packages
+        return not ("modules" in self.dist.ext or "packages" in self.dist.ext)
+
     async def _collect(self) -> bool:
         from setuptools import Distribution as SetuptoolsDistribution
         from setuptools.discovery import ConfigDiscovery
@@ -24,7 +39,7 @@ class FindPkgs(Collector):
         dist = SetuptoolsDistribution(dict(src_root=self.path))
         discovery = ConfigDiscovery(dist)
         try:
-            await anyio.to_thread.run_sync(functools.partial(discovery, name=False))
+            await limits.run_sync(functools.partial(discovery, name=False))
         except PackageDiscoveryError as exc:
             self.log.debug(f"config discovery fail: {exc}")
             return await self._collect_fallback()
@@ -37,7 +52,9 @@ class FindPkgs(Collector):
         # modules/packages
         if self.non_test_packages:
             packages = {path.split(os.sep)[-1] for path in self.non_test_packages}
-            self.log.debug(f"setting packages: {util.irepr(packages, repr=str)}")
+            self.log.debug(
+                lambda: f"setting packages: {util.irepr(packages, repr=str)}"
+            )
             self.dist.ext.packages = packages
         else:  # pragma: no ptest cover
             util.raise_on_hit()
@@ -50,7 +67,9 @@ class FindPkgs(Collector):
                 and not fnmatch(path.split(os.sep)[-1], FindTests.FILE_GLOB)
             }
             if modules:  # pragma: no branch
-                self.log.debug(f"setting modules: {util.irepr(modules, repr=str)}")
+                self.log.debug(
+                    lambda: f"setting modules: {util.irepr(modules, repr=str)}"
+                )
                 self.dist.ext.modules = modules
             else:
                 return False
@@ -12,6 +12,8 @@ from .collector import Collector
 
 @dataclasses.dataclass(**DATACLASS_DEFAULTS)
 class FindTests(Collector):
+    PRODUCES: ClassVar[frozenset[str]] = frozenset(("ext.tests",))
+
     FILE_GLOB: ClassVar[str] = "*test*.py"
 
     async def _collect(self) -> bool:
@@ -36,6 +38,6 @@ class FindTests(Collector):
             else:  # pragma: no ftest ptest cover
                 util.raise_on_hit()
             self.dist.ext.tests = set(tests)
-            self.log.debug(f"found tests: {util.irepr(tests, repr=str)}")
+            self.log.debug(lambda: f"found tests: {util.irepr(tests, repr=str)}")
             return True
         return False
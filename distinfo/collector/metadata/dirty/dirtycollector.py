@@ -1,70 +1,117 @@
 from __future__ import annotations
 
 import dataclasses
+import logging
 import os
+import subprocess
 import sys
 import textwrap
-from typing import ClassVar
+from typing import TYPE_CHECKING, ClassVar
 
-from box import Box
-
-from .... import command, const, util
+from .... import command, const, limits, monkey, protocol
 from ....base import DATACLASS_DEFAULTS
 from ..metadatacollector import MetadataCollector
 
+if TYPE_CHECKING:
+    from typing import Any
+
 
 @dataclasses.dataclass(**DATACLASS_DEFAULTS)
 class DirtyCollector(MetadataCollector):
+    COST: ClassVar[int] = 2
+
+    # seconds the subprocess may run, overridden per class by the `timeouts` option
+    TIMEOUT: ClassVar[float | None] = 300.0
+
+    # ext.collectors value for a collector that timed out
+    TIMED_OUT: ClassVar[str] = "timeout"
+
     ENV_PASS: ClassVar[tuple[str, ...]] = (
-        util.envvar("verbose"),
         "PATH",
         "PYTHONPATH",
         "DISTINFO_RAISE_ON_HIT",
     )
 
+    timed_out: bool = False
+
+    @property
+    def timeout(self) -> float | None:
+        return (self.options.timeouts or {}).get(type(self).__name__, self.TIMEOUT)
+
+    async def __call__(self) -> bool:
+        result = await super(DirtyCollector, self).__call__()
+        if self.timed_out:
+            self.dist.ext.collectors[type(self).__name__] = self.TIMED_OUT
+        return result
+
     async def _collect(self) -> bool:
-        if self.options.modify_globals:
-            return await self._collect_dirty()
-        # build cmd env
-        env = {key: os.environ[key] for key in self.ENV_PASS if key in os.environ}
-        # add include/exclude
-        for key in ("include", "exclude"):
-            value = self.options.get(key)
-            if value is not None:  # pragma: no branch
-                env[util.envvar(key)] = " ".join(value)
-        # add verbose
-        verbose = self.options.get("verbose", 0)
-        if verbose != 0:  # pragma: no branch
-            env[util.envvar("verbose")] = str(verbose)
-        # execute
-        cmd = [
-            sys.executable,
-            "-m",
-            const.NAME,
-            f"--collector={type(self).__name__}",
-            "--format=msgpack",
-        ]
-        self._subprocess_cmd_hook(cmd)
-        cmd.append(self.path)
-        out = await command.run(
-            *cmd,
-            input=util.dumps(self.sorted_files, fmt="msgpack"),
-            env=env,
-        )
+        async with limits.get("dirty"):
+            return await self._collect_limited()
+
+    async def _collect_limited(self) -> bool:
+        # in-process collection can't be interrupted so is only used when neither a
+        # deadline nor a timeout for this collector is set
+        if (
+            self.options.modify_globals
+            and self.options.deadline is None
+            and type(self).__name__ not in (self.options.timeouts or {})
+        ):
+            with monkey.deny_network(self.log):
+                return await self._collect_dirty()
+        # the worker runs the collector in-process so modifying its globals is fine
+        options = {
+            key: self.options[key]
+            for key in ("include", "exclude")
+            if self.options.get(key) is not None
+        }
+        options["modify_globals"] = True
+        kwargs: dict[str, Any] = {}
+        self._subprocess_kwargs_hook(kwargs)
+        try:
+            out = await command.run(
+                sys.executable,
+                "-m",
+                f"{const.NAME}.worker",
+                input=protocol.dump_request(
+                    protocol.Request(
+                        path=str(self.path),
+                        files=self.sorted_files,
+                        collector=type(self).__name__,
+                        options=options,
+                        kwargs=kwargs,
+                        level=self._subprocess_log_level(),
+                    )
+                ),
+                env={
+                    key: os.environ[key] for key in self.ENV_PASS if key in os.environ
+                },
+                timeout=self.timeout,
+            )
+        except subprocess.TimeoutExpired:
+            self.log.warning(f"timed out after {self.timeout}s")
+            self.timed_out = True
+            return False
         # load result
-        metadata = Box(util.loads(out, fmt="msgpack"))
-        result = metadata.ext.collectors.pop(type(self).__name__)
-        for record in metadata.ext.pop("log", []):
+        result, fields, requires, records = protocol.load_result(out)
+        for _levelno, _name, msg in records:
             # whatever it was logged at we log at debug here - warnings from setup.py
             # are not interesting in this context
-            self.log.debug(record["msg"], *record.get("args", []), noself=True)
-        await self.dist.merge(metadata)
+            self.log.debug(msg, noself=True)
+        await self.dist.merge(dict(fields, requires=requires), typed=True)
         return result
 
+    def _subprocess_log_level(self) -> int:
+        # records come back logged at debug, if that's not enabled the worker needn't
+        # log anything
+        if self.log.isEnabledFor(logging.DEBUG):
+            return logging.root.getEffectiveLevel()
+        return logging.CRITICAL + 1
+
     async def _collect_dirty(self) -> bool:
         raise NotImplementedError
 
-    def _subprocess_cmd_hook(self, cmd: list[str]) -> None:
+    def _subprocess_kwargs_hook(self, kwargs: dict[str, Any]) -> None:
+        # set `Distribution` attributes the worker needs from this process
         pass
 
     def _log_build_exc(self, exc: BaseException) -> None:
@@ -3,27 +3,52 @@ from __future__ import annotations
 import contextlib
 import dataclasses
 import importlib
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 import anyio
 
-from .... import util
+from .... import const, limits, util
 from ....base import DATACLASS_DEFAULTS
 from .dirtycollector import DirtyCollector
+from .setuptoolsmetadata import SetuptoolsMetadata
 
 if TYPE_CHECKING:
     from types import ModuleType
+    from typing import Any
 
 
 @dataclasses.dataclass(**DATACLASS_DEFAULTS)
 class PyProjectDynamicMetadata(DirtyCollector):
     # NOTE: this modifies global state by changing directory
 
+    PRODUCES: ClassVar[frozenset[str]] = DirtyCollector.PRODUCES | {"ext.packages"}
+
+    CONSUMES: ClassVar[frozenset[str]] = frozenset(
+        ("dynamic", "ext.build_backend", "ext.collectors", "ext.tests")
+    )
+
+    PRIORITY: ClassVar[int] = 1
+
+    async def wanted(self) -> bool:
+        # run if pyproject metadata is dynamic or the backend isn't known to the
+        # pyproject collector, setuptools.build_meta is redundant since we use the
+        # setuptools collector
+        if not await self.index.has(const.PYPROJECT_TOML):
+            return False
+        await self.index.wait()
+        return not SetuptoolsMetadata(collector=self.collector).exists and (
+            (
+                not self.dist.ext.get("collectors", {}).get("PyProjectMetadata")
+                and "build_backend" in self.dist.ext
+            )
+            or bool(self.dist.dynamic)
+        )
+
     async def _collect_dirty(self) -> bool:
         with contextlib.chdir(self.path):
             async with util.tmpdir() as tmpdir:
                 try:
-                    metadata_path = await anyio.to_thread.run_sync(
+                    metadata_path = await limits.run_sync(
                         self._backend.prepare_metadata_for_build_wheel, tmpdir
                     )
                 except Exception as exc:
@@ -35,8 +60,8 @@ class PyProjectDynamicMetadata(DirtyCollector):
                     )
                     return True
 
-    def _subprocess_cmd_hook(self, cmd: list[str]) -> None:
-        cmd.extend(("--set", f"ext.build_backend:{self.dist.ext.build_backend}"))
+    def _subprocess_kwargs_hook(self, kwargs: dict[str, Any]) -> None:
+        kwargs.setdefault("ext", {})["build_backend"] = self.dist.ext.build_backend
 
     @util.cached_property
     def _backend(self) -> ModuleType:
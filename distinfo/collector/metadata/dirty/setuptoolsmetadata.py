@@ -14,7 +14,7 @@ from typing import TYPE_CHECKING, ClassVar
 
 import anyio
 
-from .... import command, const, monkey, util
+from .... import const, limits, monkey, util, workingcopy
 from ....base import DATACLASS_DEFAULTS
 from .dirtycollector import DirtyCollector
 
@@ -36,6 +36,21 @@ class SetuptoolsMetadata(DirtyCollector):
     #  - redirecting sys.stdout
     #  - setting warning filters
 
+    PRODUCES: ClassVar[frozenset[str]] = DirtyCollector.PRODUCES | {
+        "ext.entrypoints",
+        "ext.modules",
+        "ext.packages",
+        "ext.scripts",
+        "ext.setuptools_test",
+    }
+
+    CONSUMES: ClassVar[frozenset[str]] = frozenset(("ext.tests", "ext.where"))
+
+    PRIORITY: ClassVar[int] = 2
+
+    # may also be pyproject with the setuptools.build_meta backend
+    FORMAT: ClassVar[str | None] = "setuptools"
+
     EXTRA_MAP: ClassVar[dict[str, str]] = dict(
         install_requires=const.RUN_EXTRA,
         setup_requires=const.BUILD_SYSTEM_EXTRA,
@@ -57,6 +72,10 @@ class SetuptoolsMetadata(DirtyCollector):
         self.log.spam(f"exists: {exists}")
         return exists
 
+    async def wanted(self) -> bool:
+        await self.index.wait()
+        return self.exists
+
     async def _collect_dirty(self) -> bool:
         monkey.patch_setuptools()
 
@@ -197,9 +216,9 @@ class SetuptoolsMetadata(DirtyCollector):
 
         return True
 
-    def _subprocess_cmd_hook(self, cmd: list[str]) -> None:
+    def _subprocess_kwargs_hook(self, kwargs: dict[str, Any]) -> None:
         if "where" in self.dist.ext:
-            cmd.extend(("--set", f"ext.where:@{','.join(self.dist.ext.where)}"))
+            kwargs.setdefault("ext", {})["where"] = self.dist.ext.where
 
     async def _add_requirements(
         self, extra: str, reqs: list[str] | set[str] | str
@@ -221,11 +240,20 @@ class SetuptoolsMetadata(DirtyCollector):
             async with util.tmpdir() as tmpdir:
                 # keep reference to self.path for finally clause
                 path = self.path
-                await command.run("cp", "--archive", self.path, tmpdir)
                 self.path = anyio.Path(tmpdir) / path.name
-                await command.run("chmod", "--recursive", "u+w", self.path)
+                with self.log.duration(
+                    "working copy...", lambda: ", ".join(strategies)
+                ):
+                    strategies = await limits.run_sync(
+                        workingcopy.materialise, str(path), str(self.path)
+                    )
                 try:
-                    yield
+                    with (
+                        workingcopy.copy_on_write(str(self.path))
+                        if "hardlink" in strategies
+                        else contextlib.nullcontext()
+                    ):
+                        yield
                 finally:
                     self.path = path
 
@@ -4,13 +4,14 @@ import contextlib
 import dataclasses
 import email
 from importlib.metadata import Distribution as ImportlibDistribution
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, ClassVar
 
 import anyio
 from box import Box
 
-from ... import const, util
+from ... import const, limits, util
 from ...base import DATACLASS_DEFAULTS
+from ...distribution import Distribution
 from ..collector import Collector
 
 if TYPE_CHECKING:
@@ -19,6 +20,11 @@ if TYPE_CHECKING:
 
 @dataclasses.dataclass(**DATACLASS_DEFAULTS)
 class MetadataCollector(Collector):
+    # core metadata, `ext` keys are listed explicitly
+    METADATA: ClassVar[frozenset[str]] = frozenset(Distribution.FIELDS) - {"ext"}
+
+    PRODUCES: ClassVar[frozenset[str]] = METADATA | {"ext.collectors"}
+
     async def __call__(self) -> bool:
         await super(MetadataCollector, self).__call__()
         self.dist.ext.setdefault("collectors", Box())[type(self).__name__] = self.result
@@ -29,7 +35,8 @@ class MetadataCollector(Collector):
         if reqs := tuple(r for r in reqs if r):
             await self.dist.add_requirements(extra, *reqs)
             self.log.debug(
-                f"requires[{extra or const.RUN_EXTRA}]: {util.irepr(reqs, repr=str)}"
+                lambda: f"requires[{extra or const.RUN_EXTRA}]: "
+                f"{util.irepr(reqs, repr=str)}"
             )
 
     async def update_from_pkginfo(self, pkginfo: str) -> None:
@@ -37,7 +44,7 @@ class MetadataCollector(Collector):
 
     async def update_from_importlib_metadata(self, path: anyio.Path) -> None:
         dist = ImportlibDistribution.at(path)
-        metadata = Box((await anyio.to_thread.run_sync(lambda: dist.metadata)).json)
+        metadata = Box((await limits.run_sync(lambda: dist.metadata)).json)
         if (
             path.suffix == ".egg-info"
             and "requires_dist" not in metadata
@@ -61,8 +68,7 @@ class MetadataCollector(Collector):
                 # seen in httpcore
                 p.strip().replace("/", ".")
                 for p in (
-                    await anyio.to_thread.run_sync(dist.read_text, "top_level.txt")
-                    or ""
+                    await limits.run_sync(dist.read_text, "top_level.txt") or ""
                 ).split()
             }
             if p
@@ -10,6 +10,12 @@ from .metadatacollector import MetadataCollector
 
 @dataclasses.dataclass(**DATACLASS_DEFAULTS)
 class PathMetadata(MetadataCollector):
+    PRODUCES: ClassVar[frozenset[str]] = MetadataCollector.PRODUCES | {"ext.packages"}
+
+    CONSUMES: ClassVar[frozenset[str]] = frozenset(("ext.tests",))
+
+    PRIORITY: ClassVar[int] = 3
+
     INFO_DIRS: ClassVar[list[str]] = [
         f".{info}-info/{file}"
         for info, file in dict(dist="METADATA", egg="PKG-INFO").items()
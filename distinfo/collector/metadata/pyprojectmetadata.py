@@ -8,18 +8,31 @@ except ImportError:  # pragma: no cover
 import dataclasses
 from typing import ClassVar
 
-import anyio
 from box import Box
 from packaging.version import Version
-from pyproject_metadata import ConfigurationError, StandardMetadata
 
-from ... import const, util
+from ... import const, limits, util
 from ...base import DATACLASS_DEFAULTS
 from .metadatacollector import MetadataCollector
 
 
 @dataclasses.dataclass(**DATACLASS_DEFAULTS)
 class PyProjectMetadata(MetadataCollector):
+    PRODUCES: ClassVar[frozenset[str]] = MetadataCollector.PRODUCES | {
+        "ext.build_backend",
+        "ext.entrypoints",
+        "ext.format",
+        "ext.gui_scripts",
+        "ext.scripts",
+        "ext.where",
+    }
+
+    # imports pyproject_metadata
+    COST: ClassVar[int] = 1
+
+    # reads only pyproject.toml
+    NEEDS_FILES: ClassVar[bool] = False
+
     TABLE_KEYS: ClassVar[tuple[str, str]] = ("license", "readme")
 
     @util.cached_property
@@ -29,7 +42,13 @@ class PyProjectMetadata(MetadataCollector):
         self.log.spam(f"exists: {exists}")
         return exists
 
+    async def wanted(self) -> bool:
+        return await self.index.has(const.PYPROJECT_TOML)
+
     async def _collect(self) -> bool:
+        # imported here as it is expensive, see `monkey.warmup`
+        from pyproject_metadata import ConfigurationError, StandardMetadata
+
         try:
             pyproject = Box(
                 tomllib.loads(await (self.path / const.PYPROJECT_TOML).read_text())
@@ -84,7 +103,7 @@ class PyProjectMetadata(MetadataCollector):
 
         while True:
             try:
-                metadata = await anyio.to_thread.run_sync(
+                metadata = await limits.run_sync(
                     StandardMetadata.from_pyproject, pyproject
                 )
             except ConfigurationError as exc:
@@ -109,8 +128,10 @@ class PyProjectMetadata(MetadataCollector):
         # we want dynamic unaltered, dynamic version is allowed by the spec, used by
         # flit-core
         if dynamic:
-            self.log.debug(f"dynamic: {util.irepr(dynamic)}")
-            await self.dist.update(dynamic=dynamic)
+            self.log.debug(lambda: f"dynamic: {util.irepr(dynamic)}")
+            # set directly rather than by update, which drops excluded keys, since
+            # PyProjectDynamicMetadata needs it for included dynamic keys
+            self.dist.dynamic.update(dynamic)
 
         # add extended metadata
         for key in ("entrypoints", "scripts", "gui_scripts"):
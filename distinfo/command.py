@@ -1,22 +1,25 @@
 from __future__ import annotations
 
+import codecs
 import contextlib
 import io
 import logging
+import os
+import signal
 import subprocess
-from subprocess import CalledProcessError
+from subprocess import CalledProcessError, TimeoutExpired
 from typing import TYPE_CHECKING, overload
 
 import anyio
 from anyio.streams.text import TextReceiveStream
 
-from . import util
+from . import limits, util
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import AsyncGenerator, AsyncIterator, Mapping
     from typing import Any, Literal
 
-    from anyio.abc import ByteReceiveStream
+    from anyio.abc import ByteReceiveStream, Process
 
 log = logging.getLogger(__name__)
 
@@ -29,7 +32,10 @@ async def run(*command: Any) -> bytes:
 
 @overload
 async def run(
-    *command: Any, input: bytes, env: Mapping[str, str]  # noqa: A002
+    *command: Any,
+    input: bytes,  # noqa: A002
+    env: Mapping[str, str],
+    timeout: float | None,
 ) -> bytes:
     ...
 
@@ -50,6 +56,28 @@ async def run(
     lines: bool = False,
     cwd: anyio.Path | None = None,
     env: Mapping[str, str] | None = None,
+    timeout: float | None = None,
+) -> bytes | list[str]:
+    """Run command returning stdout
+
+    If the command fails `CalledProcessError` is raised, if it runs longer than
+    `timeout` seconds it is killed along with any processes it started and
+    `TimeoutExpired` raised.
+    """
+    async with limits.get("subprocess"):
+        try:
+            with anyio.fail_after(timeout):
+                return await _run(*command, input=input, lines=lines, cwd=cwd, env=env)
+        except TimeoutError:
+            raise TimeoutExpired(command, timeout) from None  # type: ignore[arg-type]
+
+
+async def _run(
+    *command: Any,
+    input: bytes | None,  # noqa: A002
+    lines: bool,
+    cwd: anyio.Path | None,
+    env: Mapping[str, str] | None,
 ) -> bytes | list[str]:
     with util.log_duration(subprocess.list2cmdline(command), logger=log):
         if cwd is not None:
@@ -61,6 +89,8 @@ async def run(
                 stdin=subprocess.PIPE if input else subprocess.DEVNULL,
                 cwd=cwd,
                 env=env,
+                # own process group so `_kill` gets processes it starts too
+                start_new_session=True,
             ) as proc,
         ):
             stdout_buffer = io.BytesIO()
@@ -72,9 +102,8 @@ async def run(
                 await proc.stdin.aclose()
             try:
                 returncode = await proc.wait()
-            except BaseException:  # pragma: no cover - error path
-                with contextlib.suppress(ProcessLookupError):
-                    proc.kill()
+            except BaseException:
+                _kill(proc)
                 raise
         out = stdout_buffer.getvalue()
         if returncode != 0:  # pragma: no cover - error path
@@ -89,6 +118,88 @@ async def run(
         return out
 
 
+@contextlib.asynccontextmanager
+async def stream(
+    *command: Any,
+    null: bool = False,
+    batch: bool = False,
+    cwd: anyio.Path | None = None,
+    env: Mapping[str, str] | None = None,
+) -> AsyncIterator[AsyncIterator[Any]]:
+    """Run command yielding an iterator of stdout lines as they are output
+
+    Lines are separated by NUL if `null` (e.g. for `git ls-files -z`) else newline and
+    empty lines are skipped. With `batch` the iterator yields lists of the lines
+    complete in each chunk read, which is cheaper for long listings. Output not
+    consumed is discarded, on exit the process is waited on and `CalledProcessError`
+    raised as for `run`.
+    """
+    async with limits.get("subprocess"):
+        with util.log_duration(subprocess.list2cmdline(command), logger=log):
+            if cwd is not None:
+                log.debug(f"cwd: {cwd}")
+            async with (
+                anyio.create_task_group() as tg,
+                await anyio.open_process(
+                    list(map(str, command)),
+                    stdin=subprocess.DEVNULL,
+                    cwd=cwd,
+                    env=env,
+                    start_new_session=True,
+                ) as proc,
+            ):
+                stderr_lines: list[str] = []
+                tg.start_soon(_process_stderr, proc.stderr, stderr_lines)
+                lines = _batches(proc.stdout, "\0" if null else "\n")
+                if not batch:
+                    lines = _lines(lines)
+                try:
+                    yield lines
+                    # drain so the process doesn't block on a full pipe
+                    await lines.aclose()
+                    async for _chunk in proc.stdout:
+                        pass
+                    returncode = await proc.wait()
+                except BaseException:  # pragma: no cover - error path
+                    _kill(proc)
+                    raise
+            if returncode != 0:
+                raise CalledProcessError(
+                    returncode,
+                    command,
+                    None,
+                    "\n".join(stderr_lines),
+                )
+
+
+def _kill(proc: Process) -> None:
+    # the process group, e.g. a setup.py and whatever it ran, not just the process
+    with contextlib.suppress(ProcessLookupError):
+        os.killpg(proc.pid, signal.SIGKILL)
+
+
+async def _batches(
+    stream: ByteReceiveStream, sep: str
+) -> AsyncGenerator[list[str], None]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in stream:
+        *lines, pending = (pending + decoder.decode(chunk)).split(sep)
+        if lines := [line for line in lines if line]:
+            yield lines
+    if pending := pending + decoder.decode(b"", final=True):
+        yield [pending]
+
+
+async def _lines(batches: AsyncGenerator[list[str], None]) -> AsyncGenerator[str, None]:
+    try:
+        async for lines in batches:
+            for line in lines:
+                yield line
+    finally:
+        await batches.aclose()
+
+
 async def _process_stdout(stream: ByteReceiveStream, buffer: io.BytesIO) -> None:
     async for chunk in stream:
         buffer.write(chunk)
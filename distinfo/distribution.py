@@ -4,11 +4,9 @@ import dataclasses
 import functools
 from typing import TYPE_CHECKING, ClassVar
 
-import anyio
 import deepmerge
 from box import Box
 from packaging.markers import Op, Value, Variable
-from packaging.requirements import InvalidRequirement
 from packaging.utils import canonicalize_name
 
 from . import const, util
@@ -20,8 +18,6 @@ if TYPE_CHECKING:
     import email
     import logging
 
-    from .requirement import Requirement
-
     BaseDistributionKeyType = set[str] | str | tuple
     DistributionDictKeyType = dict[str, BaseDistributionKeyType]
     # XXX: this isn't right - it doesn't deal with nested dicts properly
@@ -127,10 +123,7 @@ class BaseDistribution:
         # convert requires str dict to Requires
         if requires is not None:  # pragma: no ptest cover
             for extra, reqstrs in requires.items():  # type: ignore[union-attr]
-                self.requires[extra] = {
-                    await self.requires._requirement_factory(reqstr)
-                    for reqstr in reqstrs
-                }
+                self.requires.add_reqstrs(extra, *reqstrs)
         if attrs is not None:  # pragma: no ftest ptest cover
             await self.update(attrs)
         return self
@@ -143,36 +136,59 @@ class BaseDistribution:
         return f"{self.name}-{self.version}"
 
     def to_dict(self, *, core_metadata: bool = False) -> Box:
-        metadata = Box(
-            {
-                key: value
-                for key, value in dataclasses.asdict(self).items()
-                if value and not self._excluded(key)
-            }
-        )
-        # core metadata compat: output requires as requires_dist and provides_extra
-        if core_metadata:  # pragma: no ptest cover
-            if requires := metadata.pop("requires", None):
-                if self.requires._evaled:
-                    requires = self.requires._raw
-                metadata.requires_dist = set()
-                metadata.provides_extra = set()
-                for extra, reqs in requires.items():
-                    for req in reqs:
-                        if extra != const.RUN_EXTRA:
-                            extra = extra.replace("_", "-")
-                            metadata.provides_extra.add(extra)
-                            marker = Marker.factory(
-                                [(Variable("extra"), Op("=="), Value(extra))]
-                            )
-                            if req.marker:
-                                marker &= req.marker
-                            req = req.replace(marker=marker)
-                        metadata.requires_dist.add(str(req))
-            if "ext" in metadata:
-                del metadata.ext
+        # driven by FIELDS rather than `dataclasses.asdict` so excluded and empty fields
+        # are skipped before they are copied, sets are copied shallow since their
+        # members are immutable and requirements are rendered straight to str - the
+        # result is clean so needs no further `util.clean_dict` when dumped
+        metadata = Box()
+        for key, field in self.FIELDS.items():
+            if (
+                not isinstance(field, dataclasses.Field)
+                or self._excluded(key)
+                or not (value := getattr(self, key))
+            ):
+                continue
+            match value:
+                case Requires():
+                    if core_metadata:  # pragma: no ptest cover
+                        metadata.update(
+                            (k, v) for k, v in self._requires_dist().items() if v
+                        )
+                        continue
+                    value = {
+                        extra: {str(req) for req in reqs}
+                        for extra, reqs in value.items()
+                        if reqs
+                    }
+                case dict():
+                    if core_metadata:  # pragma: no ptest cover
+                        continue
+                    value = util.clean_dict(value)
+                case set():
+                    value = set(value)
+            if value:
+                metadata[key] = value
         return metadata
 
+    def _requires_dist(self) -> dict[str, set[str]]:
+        # core metadata compat: output requires as requires_dist and provides_extra
+        requires = self.requires._raw if self.requires._evaled else self.requires
+        requires_dist = set()
+        provides_extra = set()
+        for extra, reqs in requires.items():
+            for req in reqs:
+                if extra != const.RUN_EXTRA:
+                    extra = extra.replace("_", "-")
+                    provides_extra.add(extra)
+                    marker = Marker.factory(
+                        [(Variable("extra"), Op("=="), Value(extra))]
+                    )
+                    if req.marker:
+                        marker &= req.marker
+                    req = req.replace(marker=marker)
+                requires_dist.add(str(req))
+        return dict(requires_dist=requires_dist, provides_extra=provides_extra)
+
     async def update(
         self,
         attrs: dict[str, DistributionKeyType | list[str]] | email.Message = None,
@@ -258,25 +274,31 @@ class BaseDistribution:
 
         # parse requires_dist to Requirement and set Requires
         if (requires_dist := multi.pop("requires_dist", None)) is not None:
-            reqs: dict[str, Requirement] = {}
-            async with anyio.create_task_group() as tg:
-                for reqstr in requires_dist:
-                    tg.start_soon(self._parse_reqstr, reqstr, reqs)
-            for req in reqs.values():
+            for req in self.requires.parse(*requires_dist):
                 if req.marker is not None and req.marker.extras:
                     extras = req.marker.extras
                     req = req.replace(marker=req.marker.replace(extras=set()))
                 else:
                     extras = {const.RUN_EXTRA}
                 for extra in extras:
-                    self.requires.setdefault(extra.replace("-", "_"), set()).add(req)
+                    self.requires.add_requirements(extra.replace("-", "_"), req)
 
         # merge to self
         if multi:
             await self.merge(multi)
 
-    async def merge(self, metadata: dict) -> None:
-        for key, value in util.list_to_set(metadata).items():
+    async def merge(self, metadata: dict, *, typed: bool = False) -> None:
+        # typed metadata, e.g. decoded by `protocol`, already has sets so skips list
+        # conversion
+        for key, value in (metadata if typed else util.list_to_set(metadata)).items():
+            if key == "requires":
+                for extra, reqs in value.items():
+                    self.requires.add_requirements(
+                        extra,
+                        *self.requires.parse(*(r for r in reqs if isinstance(r, str))),
+                        *(r for r in reqs if not isinstance(r, str)),
+                    )
+                continue
             match current := getattr(self, key):
                 case set():
                     current |= value
@@ -284,49 +306,12 @@ class BaseDistribution:
                     deepmerge.always_merger.merge(current, value)
                 case _:
                     setattr(self, key, value)
-            if key == "requires":
-                for extra in value:
-                    await self._merge_reqs(extra)
 
     async def add_requirements(self, extra: str, *reqstrs: str) -> None:
         if not extra:  # pragma: no ptest cover
             util.raise_on_hit()
             extra = const.RUN_EXTRA
-        reqs: dict[str, Requirement] = {}
-        async with anyio.create_task_group() as tg:
-            for reqstr in reqstrs:
-                tg.start_soon(self._parse_reqstr, reqstr, reqs)
-        if filtered_reqs := set(reqs.values()):
-            canonical_extra = canonicalize_name(extra).replace("-", "_")
-            self.requires.setdefault(canonical_extra, set()).update(filtered_reqs)
-            await self._merge_reqs(canonical_extra)
-
-    async def _parse_reqstr(self, reqstr: str, reqs: dict) -> None:
-        try:
-            req = await self.requires._requirement_factory(reqstr)
-        except InvalidRequirement as exc:
-            self.log.debug(f"invalid requirement {reqstr!r}: {exc}")
-        else:
-            # ignore self-alias with no extras - seen in setupmeta
-            if not (req.name == self.name and not req.extras):
-                self._merge_req(req, reqs)
-
-    async def _merge_reqs(self, extra: str) -> None:
-        seen: dict[str, Requirement] = {}
-        reqs = self.requires.get(extra, set())
-        for req in list(reqs):
-            if isinstance(req, str):
-                reqs.remove(req)
-                req = await self.requires._requirement_factory(req)
-                reqs.add(req)
-            self._merge_req(req, seen)
-
-    def _merge_req(self, req: Requirement, seen: dict[str, Requirement]) -> None:
-        if (base_req := seen.get(req.name + str(req.marker))) is None:
-            seen[req.name + str(req.marker)] = req
-        else:
-            self.log.debug(f"merge dupe {req!r} to {base_req!r}")
-            base_req &= req
+        self.requires.add_reqstrs(canonicalize_name(extra).replace("-", "_"), *reqstrs)
 
     @staticmethod
     def _filter_value(value: str) -> str | None:
@@ -347,6 +332,20 @@ class BaseDistribution:
         #   https://packaging.python.org/en/latest/specifications/core-metadata/#keywords
         return set(value.split(" " if " " in value else ","))
 
+    def _filled(self, key: str) -> bool:
+        # whether an update can no longer change key: set in __init__ or a single value
+        # that is set, multi-value keys accumulate and metadata_version and license are
+        # replaced by a preferred value
+        if key in self._init_keys:
+            return True
+        field = self.FIELDS.get(key)
+        return (
+            isinstance(field, dataclasses.Field)
+            and field.default is None
+            and key not in ("metadata_version", "license")
+            and getattr(self, key) is not None
+        )
+
     def _excluded(self, key: str) -> bool:
         # "description" is "readme" in pyproject.toml
         if key == "readme":
@@ -0,0 +1,134 @@
+"""Process-wide concurrency limits shared by every collection
+
+`from_path` may be run concurrently any number of times, these limiters bound what all
+of those runs may have in flight at once:
+
+    subprocess: processes run by `command.run` e.g. tar, unzip, git, find
+    dirty:      dirty collector executions, each of which may be a python process
+    thread:     worker threads, `run_sync` is `anyio.to_thread.run_sync` using this
+
+Defaults derive from the cgroup cpu and memory limits when in a container, otherwise
+from the cpus available to the process, and may be changed with `configure`. Limiters
+are per event loop, which anyio requires, so the limits hold across the runs in a loop.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+import pathlib
+from typing import TYPE_CHECKING
+
+import anyio
+from anyio.lowlevel import RunVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import Any
+
+log = logging.getLogger(__name__)
+
+CGROUP = "/sys/fs/cgroup"
+
+# rough peak memory of a dirty collector execution, python plus setuptools plus setup.py
+DIRTY_MEMORY = 256 * 1024**2
+
+LIMITS = ("subprocess", "dirty", "thread")
+
+_limiters: RunVar[dict[str, anyio.CapacityLimiter]] = RunVar("_limiters")
+
+_totals: dict[str, int] = {}
+
+
+def _read(*parts: str) -> str | None:
+    # sync since these are tiny, in memory and read once
+    try:
+        return pathlib.Path(CGROUP, *parts).read_text().strip()
+    except OSError:
+        return None
+
+
+def cpu_count() -> int:
+    """CPUs available, the cgroup cpu quota if there is one"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - not linux
+        cpus = os.cpu_count() or 1
+    # cgroup v2 then v1
+    if (value := _read("cpu.max")) is not None:
+        quota, _, period = value.partition(" ")
+    else:
+        quota = _read("cpu", "cpu.cfs_quota_us") or "max"
+        period = _read("cpu", "cpu.cfs_period_us") or ""
+    if quota not in ("max", "-1") and period:
+        cpus = min(cpus, max(1, int(quota) // int(period)))
+    return cpus
+
+
+def memory_limit() -> int | None:
+    """Memory limit in bytes from the cgroup if there is one"""
+    # cgroup v2 then v1, v1 "unlimited" is a huge page-aligned number
+    value = _read("memory.max") or _read("memory", "memory.limit_in_bytes")
+    if value is None or value == "max" or int(value) >= 2**62:
+        return None
+    return int(value)
+
+
+@functools.cache
+def defaults() -> dict[str, int]:
+    cpus = cpu_count()
+    dirty = cpus
+    if (memory := memory_limit()) is not None:
+        dirty = max(1, min(dirty, memory // DIRTY_MEMORY))
+    totals = dict(
+        # mostly waiting on io
+        subprocess=cpus * 2,
+        dirty=dirty,
+        # as concurrent.futures.ThreadPoolExecutor
+        thread=min(32, cpus + 4),
+    )
+    log.debug(f"default limits: {totals}")
+    return totals
+
+
+def configure(**totals: int | None) -> None:
+    """Set limiter totals, None keeps the current total"""
+    for name, total in totals.items():
+        if name not in LIMITS:
+            raise ValueError(f"unknown limit {name!r}")
+        if total is None:
+            continue
+        if total < 1:
+            raise ValueError(f"{name} limit must be at least 1")
+        _totals[name] = total
+        if name in (limiters := _loop_limiters()):
+            limiters[name].total_tokens = total
+
+
+def _loop_limiters() -> dict[str, anyio.CapacityLimiter]:
+    # the running event loop's limiters, none outside of one
+    try:
+        return _limiters.get()
+    except LookupError:
+        limiters: dict[str, anyio.CapacityLimiter] = {}
+        _limiters.set(limiters)
+        return limiters
+    except RuntimeError:
+        return {}
+
+
+def get(name: str) -> anyio.CapacityLimiter:
+    # limiters are created on first use since that needs a running event loop
+    limiters = _loop_limiters()
+    try:
+        return limiters[name]
+    except KeyError:
+        limiter = limiters[name] = anyio.CapacityLimiter(
+            _totals.get(name) or defaults()[name]
+        )
+        return limiter
+
+
+async def run_sync(func: Callable[..., Any], *args: Any) -> Any:
+    return await anyio.to_thread.run_sync(func, *args, limiter=get("thread"))
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import atexit
 import logging
-import math
 import os
+import queue
 import time
-from logging.handlers import BufferingHandler
+from logging.handlers import QueueHandler, QueueListener
 
 import anyio
 import coloredlogs
@@ -12,18 +13,71 @@ from box import Box
 
 from . import util
 
+log = logging.getLogger(__name__)
+
 COLOR_DEFAULT = "auto"
 
 COLOR_CHOICES = (COLOR_DEFAULT, "always", "never")
 
+# records held between the event loop and the listener thread before logging blocks,
+# or drops when lossy
+QUEUE_SIZE = 10_000
+
+
+class _QueueListener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # the default doesn't block so fails on a full queue
+        self.queue.put(self._sentinel)  # type: ignore[attr-defined]
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler on a bounded queue drained by a listener thread to `handlers`
+
+    When the queue is full records below `drop_below` are dropped and counted, others
+    block until there is space. Records are queued as they are, messages, arguments and
+    tracebacks are formatted by the listener thread's handlers.
+    """
+
+    def __init__(
+        self,
+        *handlers: logging.Handler,
+        maxsize: int = QUEUE_SIZE,
+        drop_below: int = logging.NOTSET,
+    ) -> None:
+        super().__init__(queue.Queue(maxsize))
+        self.drop_below = drop_below
+        self.dropped = 0
+        self.listener = _QueueListener(
+            self.queue, *handlers, respect_handler_level=True
+        )
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # the default formats on the calling thread, the event loop, to make the record
+        # picklable for a multiprocessing queue - this queue is in-process
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if record.levelno < self.drop_below:
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+        else:
+            self.queue.put(record)
+
+
+_handler: BoundedQueueHandler | None = None
+
 
 async def configure(
     *,
     debug: bool = False,
     verbosity: int = 0,
-    buffer: bool = False,
     color: str = COLOR_DEFAULT,
-) -> BufferingHandler | None:
+    lossy: bool = False,
+) -> None:
+    # drop any previous queue so coloredlogs finds its handler to reconfigure
+    shutdown()
     # as it says
     logging.captureWarnings(capture=True)
     # read config
@@ -50,15 +104,39 @@ async def configure(
     logging.root.setLevel(getattr(logging, cfg.config.level.upper()))
     for logger, level in cfg.loggers.items():
         logging.getLogger(logger).setLevel(getattr(logging, level.upper()))
-    # option: buffering handler
-    if buffer:
-        handler = BufferingHandler(capacity=math.inf)  # type: ignore[arg-type]
-        logging.root.handlers = [handler]
-        return handler
     # NO_COLOR: see https://no-color.org/
     cfg.config.isatty = (
         None if "NO_COLOR" in os.environ or color == "auto" else color == "always"
     )
     coloredlogs.install(**cfg.config)
+    # format and write from a thread so terminal io doesn't block the event loop
+    _install_queue(drop_below=logging.INFO if lossy else logging.NOTSET)
     # reset start time so we don't count imports
     logging._startTime = time.time()  # type: ignore[attr-defined]
+
+
+def _install_queue(**kwargs: int) -> None:
+    global _handler
+    # move only the coloredlogs handler, others on root (e.g. pytest's) are left be
+    stream_handler, _logger = coloredlogs.find_handler(
+        logging.root, coloredlogs.match_stream_handler
+    )
+    logging.root.removeHandler(stream_handler)
+    _handler = BoundedQueueHandler(stream_handler, **kwargs)
+    logging.root.addHandler(_handler)
+    _handler.listener.start()
+
+
+@atexit.register
+def shutdown() -> None:
+    """Flush queued records and log synchronously from here on"""
+    global _handler
+    if _handler is None:
+        return
+    handler, _handler = _handler, None
+    handler.listener.stop()
+    logging.root.removeHandler(handler)
+    for stream_handler in handler.listener.handlers:
+        logging.root.addHandler(stream_handler)
+    if handler.dropped:
+        log.warning(f"dropped {handler.dropped} log records below info")
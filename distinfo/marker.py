@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import copy
 import dataclasses
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, cast
 
 from packaging.markers import (
     Marker as _Marker,
@@ -17,11 +16,82 @@ from packaging.utils import canonicalize_name
 from .base import DATACLASS_DEFAULTS, Base
 
 if TYPE_CHECKING:
+    from typing import TypeAlias
+
     from packaging._parser import MarkerItem, MarkerVar
 
+    # a normalized marker tree: an atom or a tuple of ("and" | "or", children)
+    MarkerTree: TypeAlias = MarkerItem | tuple[str, list]
+
 AND_OR = ("and", "or")
 
 
+def normalize(markers: list[MarkerItem]) -> list[MarkerItem]:
+    """Normal form: flattened, deduplicated, absorbed and sorted"""
+    tree = _tree(markers)
+    return [] if tree is None else _list(tree)
+
+
+def _tree(markers: list[MarkerItem]) -> MarkerTree | None:
+    # "and" binds tighter than "or", same as `packaging.markers._evaluate_markers`
+    disjuncts: list[list[MarkerTree | None]] = [[]]
+    for marker in markers:
+        if marker == "or":
+            disjuncts.append([])
+        elif marker != "and":
+            disjuncts[-1].append(_tree(marker) if isinstance(marker, list) else marker)
+    return _join("or", [_join("and", conjuncts) for conjuncts in disjuncts])
+
+
+def _join(conj: str, children: list[MarkerTree | None]) -> MarkerTree | None:
+    # flatten nested groups of the same connective and drop duplicates
+    flat: dict[tuple, MarkerTree] = {}
+    for child in children:
+        if child is not None:
+            for node in child[1] if _is_group(child, conj) else (child,):
+                flat.setdefault(_key(node), node)
+    # absorption: "A and (A or B)" -> "A", "A or (A and B)" -> "A"
+    for key, child in list(flat.items()):
+        if _is_group(child) and any(
+            _terms(node, conj) <= flat.keys() - {key} for node in child[1]
+        ):
+            del flat[key]
+    if not flat:
+        return None
+    if len(flat) == 1:
+        return next(iter(flat.values()))
+    return (conj, [flat[key] for key in sorted(flat)])
+
+
+def _is_group(node: MarkerTree, conj: str | None = None) -> bool:
+    # atoms are tuples of `packaging._parser.Node`
+    return isinstance(node[0], str) and (conj is None or node[0] == conj)
+
+
+def _terms(node: MarkerTree, conj: str) -> set[tuple]:
+    return {_key(n) for n in node[1]} if _is_group(node, conj) else {_key(node)}
+
+
+def _key(node: MarkerTree) -> tuple:
+    # atoms sort before groups, the leading int means mixed keys are never compared
+    # beyond the first item
+    if _is_group(node):
+        return (1, node[0], tuple(_key(n) for n in node[1]))
+    return (0, tuple(n.serialize() for n in cast("MarkerItem", node)))
+
+
+def _list(node: MarkerTree) -> list[MarkerItem]:
+    if not _is_group(node):
+        return [node]
+    conj, children = node
+    markers: list[MarkerItem] = []
+    for child in children:
+        if markers:
+            markers.append(conj)
+        markers.append(_list(child) if _is_group(child) else child)
+    return markers
+
+
 @dataclasses.dataclass(**DATACLASS_DEFAULTS)
 class BaseMarker(_Marker):
     _markers: list[MarkerItem]
@@ -49,7 +119,7 @@ class BaseMarker(_Marker):
                     markers.pop(0)
             else:
                 filtered_markers.append(marker)
-        return cls(filtered_markers, extras)
+        return cls(normalize(filtered_markers), extras)
 
     @staticmethod
     def _get_extra(lhs: MarkerVar, _op: Op, rhs: MarkerVar) -> str | None:
@@ -58,11 +128,24 @@ class BaseMarker(_Marker):
         if isinstance(rhs, Variable) and rhs.value == "extra":
             return lhs.value
 
+    @property
+    def key(self) -> tuple:
+        tree = _tree(self._markers)
+        return (tuple(sorted(self.extras)), None if tree is None else _key(tree))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BaseMarker):
+            return self.key == other.key
+        return str(self) == other
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
     def __str__(self) -> str:
         markers = self._markers.copy()
         if self.extras:
             extras: list[tuple | str] = []
-            for i, extra in enumerate(self.extras):
+            for i, extra in enumerate(sorted(self.extras)):
                 if i > 0:
                     extras.append("or")
                 extras.append((Variable("extra"), Op("=="), Value(extra)))
@@ -75,16 +158,13 @@ class BaseMarker(_Marker):
     def __bool__(self) -> bool:
         return bool(self._markers) or bool(self.extras)
 
-    def __iand__(self, marker: Marker) -> BaseMarker:
-        if not self._markers:
-            self._markers = marker._markers
-        elif marker:
-            self._markers.extend(("and", marker._markers))
-        self.extras |= marker.extras
-        return self
-
     def __and__(self, marker: Marker) -> BaseMarker:
-        return self.__class__.__iand__(copy.copy(self), marker)
+        # a new marker, also for `&=`, since markers are shared by copies and by
+        # requirements that cache their rendering
+        return self.__class__(
+            normalize([self._markers, "and", marker._markers]),
+            self.extras | marker.extras,
+        )
 
     def evaluate(
         self,
@@ -95,4 +175,17 @@ class BaseMarker(_Marker):
 
 @dataclasses.dataclass(**DATACLASS_DEFAULTS)
 class Marker(Base, BaseMarker):
-    ...
+    CACHE_STR = True
+
+    # compare structurally rather than by str as `Base` does, defining __eq__ unsets
+    # __hash__ so restore it
+    __eq__ = BaseMarker.__eq__
+
+    __hash__ = Base.__hash__
+
+    _hash = BaseMarker.__hash__
+
+    @property
+    def key(self) -> tuple:
+        # zero-argument super() has no self inside the lambda
+        return self._cached("_key", lambda: super(Marker, self).key)
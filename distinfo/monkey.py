@@ -7,6 +7,15 @@ import verboselogs
 
 verboselogs.install()
 
+import contextlib
+import os
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import logging
+    from collections.abc import Generator
+
 
 # patch setuptools on demand only because its an expensive import, importing setuptools
 # has the side-effect of hacking in a patched distutils
@@ -24,9 +33,111 @@ def patch_setuptools() -> None:  # pragma: no utest cover
         discovery.log.warn = discovery.log.debug  # type: ignore[method-assign]
 
 
+# heavy imports done by `warmup`
+WARMUP_MODULES = ("setuptools", "setuptools.discovery", "pyproject_metadata")
+
+_warmup_thread = None
+
+
+def warmup() -> None:
+    """Start importing heavy modules in a background thread, once per process
+
+    Collectors import these on first use, warming them up while archives are extracted
+    and files are listed takes them off the critical path. The import lock makes a
+    collector importing one of these wait for the thread rather than import it twice.
+    """
+    global _warmup_thread
+    if _warmup_thread is None:
+        import threading
+
+        _warmup_thread = threading.Thread(
+            target=_warmup, name=f"{__package__}-warmup", daemon=True
+        )
+        _warmup_thread.start()
+
+
+def _warmup() -> None:
+    import importlib
+    import logging
+
+    log = logging.getLogger(__name__)
+    for module in WARMUP_MODULES:
+        try:
+            importlib.import_module(module)
+        except Exception as exc:  # pragma: no cover - raised again on real import
+            log.debug(f"warmup {module} fail: {exc}")
+            return
+    patch_setuptools()
+    log.debug(f"warmup: {', '.join(WARMUP_MODULES)}")
+
+
+class NetworkDeniedError(PermissionError):
+    """Raised for network access while `deny_network` is active"""
+
+
+# count of active `deny_network` and the accesses denied while any is
+_deny_count = 0
+
+_denied: list[str] = []
+
+_audit_hooked = False
+
+
+@contextlib.contextmanager
+def deny_network(log: logging.Logger) -> Generator[None, None, None]:
+    """Deny network access while dirty collectors run setup.py or a build backend
+
+    Offline, setup.py fetching setup_requires or making http requests hangs until tcp
+    timeouts. An audit hook, installed on first use since it can't be removed, raises
+    `NetworkDeniedError` for socket connect and address lookup, other than for unix
+    sockets, and for running pip, which is how setuptools `fetch_build_eggs` installs.
+    Denied accesses are logged on exit.
+    """
+    global _deny_count, _audit_hooked
+    if not _audit_hooked:
+        sys.addaudithook(_audit_hook)
+        _audit_hooked = True
+    start = len(_denied)
+    _deny_count += 1
+    try:
+        yield
+    finally:
+        _deny_count -= 1
+        if denied := _denied[start:]:
+            log.info(f"denied network access: {', '.join(denied)}")
+        if not _deny_count:
+            _denied.clear()
+
+
+def _audit_hook(event: str, args: tuple) -> None:
+    # called for every audited event so returns as soon as possible
+    if not _deny_count:
+        return
+    if event == "socket.connect":
+        import socket
+
+        if args[0].family == socket.AF_UNIX:
+            return
+        denied = f"connect to {args[1]!r}"
+    elif event == "socket.getaddrinfo":
+        denied = f"lookup of {args[0]!r}"
+    elif event == "subprocess.Popen":
+        argv = args[1] if isinstance(args[1], (list, tuple)) else [args[1]]
+        argv = [os.fsdecode(arg) for arg in argv]
+        # empty with an explicit executable, Popen handles that itself
+        if not argv or not (
+            os.path.basename(argv[0]).startswith("pip") or argv[1:3] == ["-m", "pip"]
+        ):
+            return
+        denied = f"running {' '.join(argv)!r}"
+    else:
+        return
+    _denied.append(denied)
+    raise NetworkDeniedError(f"network access denied: {denied}")
+
+
 # FIXME: set tempfile.tempdir directly since tempfile._get_default_tempdir fails under
 # high concurrency
-import os
 import tempfile
 
 tempdir = os.getenv("TMPDIR")
@@ -0,0 +1,196 @@
+"""msgpack protocol between `DirtyCollector` and the subprocess it runs itself in
+
+Messages are versioned arrays, sets, requirements and marker atoms travel as msgpack
+ext types so they decode straight to their python types rather than via str:
+
+    request: [VERSION, path, files, collector, options, kwargs, level]
+    result:  [VERSION, result, fields, requires, log]
+
+The request carries everything the worker needs to run the collector: `options` are
+`DistCollector` options, `kwargs` are `Distribution` attributes and `level` is the log
+level. `fields` maps `Distribution` field to value, `requires` maps extra to a list of
+`Requirement` and `log` is a list of `(levelno, name, message)`.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from typing import TYPE_CHECKING
+
+import msgpack
+from packaging.markers import Op, Value, Variable
+
+from .marker import Marker
+from .requirement import BaseRequirement, Requirement
+from .specifier import SpecifierSet
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Any
+
+    from .distribution import BaseDistribution
+
+    LogTupleType = tuple[int, str, str]
+
+VERSION = 2
+
+# ext type codes
+SET = 1
+REQUIREMENT = 2
+MARKER = 3
+MARKER_ATOM = 4
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+def _pack(obj: Any) -> bytes:
+    return msgpack.packb(obj, default=_default)
+
+
+def _unpack(data: bytes) -> Any:
+    return msgpack.unpackb(data, ext_hook=_ext_hook)
+
+
+def _default(obj: Any) -> msgpack.ExtType:
+    match obj:
+        case set() | frozenset():
+            return msgpack.ExtType(SET, _pack(list(obj)))
+        case BaseRequirement():
+            return msgpack.ExtType(
+                REQUIREMENT,
+                _pack(
+                    (
+                        obj.name,
+                        obj.name_base,
+                        list(obj.extras),
+                        str(obj.specifier),
+                        obj.marker,
+                        obj.url,
+                    )
+                ),
+            )
+        case Marker():
+            return msgpack.ExtType(
+                MARKER, _pack((_pack_markers(obj._markers), list(obj.extras)))
+            )
+    raise TypeError(f"can't serialize {obj!r}")
+
+
+def _pack_markers(markers: list) -> list:
+    # atoms are tuples, which msgpack can't tell from lists, so are tagged
+    return [
+        _pack_markers(marker)
+        if isinstance(marker, list)
+        else marker
+        if isinstance(marker, str)
+        else msgpack.ExtType(
+            MARKER_ATOM,
+            _pack(
+                [
+                    (isinstance(node, Variable), node.value)
+                    if not isinstance(node, Op)
+                    else node.value
+                    for node in marker
+                ]
+            ),
+        )
+        for marker in markers
+    ]
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    value = _unpack(data)
+    if code == SET:
+        return set(value)
+    if code == REQUIREMENT:
+        name, name_base, extras, specifier, marker, url = value
+        return Requirement(
+            name=name,
+            name_base=name_base,
+            extras=set(extras),
+            specifier=SpecifierSet(specifier),
+            marker=marker,
+            url=url,
+        )
+    if code == MARKER:
+        markers, extras = value
+        return Marker(markers, set(extras))
+    if code == MARKER_ATOM:
+        lhs, op, rhs = value
+        return (_node(*lhs), Op(op), _node(*rhs))
+    return msgpack.ExtType(code, data)  # pragma: no cover
+
+
+def _node(is_variable: bool, value: str) -> Variable | Value:  # noqa: FBT001
+    return Variable(value) if is_variable else Value(value)
+
+
+def _check_version(message: list) -> list:
+    if not message or message[0] != VERSION:
+        raise ProtocolError(f"unsupported protocol version: {message[:1]!r}")
+    return message[1:]
+
+
+@dataclasses.dataclass(slots=True)
+class Request:
+    path: str
+
+    files: list[str]
+
+    collector: str
+
+    options: dict[str, Any] = dataclasses.field(default_factory=dict)
+
+    kwargs: dict[str, Any] = dataclasses.field(default_factory=dict)
+
+    level: int = logging.NOTSET
+
+
+def dump_request(request: Request) -> bytes:
+    return _pack(
+        [
+            VERSION,
+            request.path,
+            list(request.files),
+            request.collector,
+            request.options,
+            request.kwargs,
+            request.level,
+        ]
+    )
+
+
+def load_request(data: bytes) -> Request:
+    return Request(*_check_version(_unpack(data)))
+
+
+def dump_result(
+    dist: BaseDistribution,
+    result: bool,  # noqa: FBT001
+    log: Iterable[LogTupleType] = (),
+) -> bytes:
+    fields = {}
+    for key, field in dist.FIELDS.items():
+        if (
+            isinstance(field, dataclasses.Field)
+            and key != "requires"
+            and (value := getattr(dist, key))
+        ):
+            fields[key] = value
+    return _pack(
+        [
+            VERSION,
+            result,
+            fields,
+            {extra: list(reqs) for extra, reqs in dist.requires.items() if reqs},
+            list(log),
+        ]
+    )
+
+
+def load_result(data: bytes) -> tuple[bool, dict, dict, list[LogTupleType]]:
+    result, fields, requires, log = _check_version(_unpack(data))
+    return result, fields, requires, [tuple(record) for record in log]
@@ -12,11 +12,11 @@ from packaging.requirements import (
     InvalidRequirement,
     Requirement as PackagingRequirement,
 )
-from packaging.specifiers import SpecifierSet
 from packaging.utils import canonicalize_name
 
 from .base import DATACLASS_DEFAULTS, Base
 from .marker import Marker
+from .specifier import SpecifierSet
 
 if TYPE_CHECKING:
     from typing import Any
@@ -98,7 +98,8 @@ class BaseRequirement:
             if self.marker is None:
                 self.marker = req.marker
             elif self.marker != req.marker:
-                self.marker &= req.marker
+                # not in-place since the marker may be shared with a copy
+                self.marker = self.marker & req.marker
         return self
 
     def __and__(self, req: BaseRequirement) -> BaseRequirement:
@@ -107,4 +108,4 @@ class BaseRequirement:
 
 @dataclasses.dataclass(**DATACLASS_DEFAULTS)
 class Requirement(Base, BaseRequirement):
-    ...
+    CACHE_STR = True
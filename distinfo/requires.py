@@ -1,26 +1,37 @@
 from __future__ import annotations
 
+import logging
 from typing import TYPE_CHECKING
 
 import anyio
 import atools
 from box import Box
 from packaging.markers import default_environment
+from packaging.requirements import InvalidRequirement
 
 from . import util
 from .requirement import Requirement
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from typing import Any
 
+    from .marker import Marker
     from .requirement import BaseRequirement
 
+    IndexKeyType = tuple[str, tuple | None]
+
+log = logging.getLogger(__name__)
+
 
 class Requires(Box):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         object.__setattr__(self, "_dist", kwargs.pop("dist", None))
         object.__setattr__(self, "_evaled", False)  # noqa: FBT003
         object.__setattr__(self, "_raw", Box())
+        # per-extra dedupe index, built lazily so sets assigned directly are indexed on
+        # first add
+        object.__setattr__(self, "_index", {})
         super().__init__(*args, **kwargs)
 
     def __repr__(self) -> str:  # pragma: no ptest cover
@@ -29,6 +40,61 @@ class Requires(Box):
     def __bool__(self) -> bool:
         return any(v for v in self.values())
 
+    def parse(self, *reqstrs: str) -> list[Requirement]:
+        # parsing is pure CPU so a batch is parsed in one pass rather than a task per
+        # string, invalid requirements are dropped
+        name = None if self._dist is None else self._dist.name
+        reqs = []
+        for reqstr in reqstrs:
+            try:
+                req = self._requirement_factory(reqstr)
+            except InvalidRequirement as exc:
+                log.debug(f"invalid requirement {reqstr!r}: {exc}")
+                continue
+            # ignore self-alias with no extras - seen in setupmeta
+            if not (req.name == name and not req.extras):
+                reqs.append(req)
+        return reqs
+
+    def add_reqstrs(self, extra: str, *reqstrs: str) -> None:
+        self.add_requirements(extra, *self.parse(*reqstrs))
+
+    def add_requirements(self, extra: str, *reqs: Requirement) -> None:
+        if not reqs:
+            return
+        current = self.setdefault(extra, set())
+        if (index := self._index.get(extra)) is None:
+            index = self._index[extra] = {}
+            # index what's already there, merging any duplicates
+            for req in list(current):
+                self._add_req(req, current, index)
+        for req in reqs:
+            self._add_req(req, current, index)
+
+    @staticmethod
+    def _add_req(
+        req: Requirement,
+        reqs: set[Requirement],
+        index: dict[IndexKeyType, Requirement],
+    ) -> None:
+        # an empty marker, all extras stripped, is no marker
+        key = (req.name, req.marker.key if req.marker else None)
+        if (base_req := index.get(key)) is None or base_req not in reqs:
+            index[key] = req
+            reqs.add(req)
+        elif base_req is not req:
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug(f"merge dupe {req!r} to {base_req!r}")
+            # merge to a new requirement rather than in place since requirements are
+            # shared between extras, and merging changes the hash
+            merged = base_req & req
+            reqs.discard(req)
+            reqs.discard(base_req)
+            reqs.add(merged)
+            index[key] = merged
+            if not merged.specifier.satisfiable:
+                log.warning(f"unsatisfiable {merged!r}")
+
     async def evaluate(self, *extras: str) -> Requires:
         env = self._env()
         async with anyio.create_task_group() as tg:
@@ -44,8 +110,42 @@ class Requires(Box):
         util.clean_dict(self, inplace=True)
         util.clean_dict(self._raw, inplace=True)
         object.__setattr__(self, "_evaled", True)  # noqa: FBT003
+        # markers are dropped on evaluation so the index is rebuilt on next add
+        self._index.clear()
         return self
 
+    def evaluate_matrix(self, envs: Sequence[dict[str, str]], *extras: str) -> Box:
+        # evaluate against many environments at once, the result maps extra to
+        # requirement (without marker) to a bitmask of the indices of `envs` where the
+        # requirement applies - an int serializes compactly in every format
+        envs = [{**self._env(), **env} for env in envs]
+        all_envs = (1 << len(envs)) - 1
+        requires = self._raw if self._evaled else self
+        masks: dict[tuple, int] = {}
+        matrix = Box()
+        for extra in extras if extras else requires:  # type: ignore[attr-defined]
+            for req in requires.get(extra, set()):
+                if isinstance(req, str):  # pragma: no ptest cover
+                    req = self._requirement_factory(req)
+                if req.marker is None:
+                    mask = all_envs
+                # each distinct marker is evaluated once only, however spelt
+                elif (mask := masks.get(key := req.marker.key)) is None:
+                    mask = masks[key] = self._marker_mask(req.marker, envs)
+                if mask:
+                    reqs = matrix.setdefault(extra, {})
+                    reqstr = str(req.replace(marker=None))
+                    reqs[reqstr] = reqs.get(reqstr, 0) | mask
+        return matrix
+
+    @staticmethod
+    def _marker_mask(marker: Marker, envs: Sequence[dict[str, str]]) -> int:
+        mask = 0
+        for i, env in enumerate(envs):
+            if marker.evaluate(env):
+                mask |= 1 << i
+        return mask
+
     async def _eval_req(
         self,
         req: Requirement | str,
@@ -56,14 +156,14 @@ class Requires(Box):
         reqs.remove(req)
         if isinstance(req, str):  # pragma: no ptest cover
             util.raise_on_hit()
-            req = await self._requirement_factory(req)
+            req = self._requirement_factory(req)
         raw_reqs.add(req)
         if req.marker is not None and not req.marker.evaluate(env):
             return
         # set marker to None since it is no longer required
         reqs.add(req.replace(marker=None))
 
-    async def _requirement_factory(self, reqstr: str) -> BaseRequirement:
+    def _requirement_factory(self, reqstr: str) -> BaseRequirement:
         return Requirement.factory(reqstr)
 
     @staticmethod
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from packaging.specifiers import Specifier, SpecifierSet as _SpecifierSet
+from packaging.version import Version
+
+if TYPE_CHECKING:
+    Bound = tuple[Version, Specifier] | None
+
+# operators that don't map to an interval, these are kept as is
+OTHER_OPERATORS = ("~=", "===")
+
+
+class SpecifierSet(_SpecifierSet):
+    """SpecifierSet normalized to an interval of bounds, exclusions and a pin
+
+    Intersection with `&` keeps the minimal equivalent set of specifiers so merged
+    requirements don't accumulate redundant clauses. If the intersection is empty
+    `satisfiable` is False and the specifiers are kept unsimplified.
+    """
+
+    satisfiable: bool
+
+    def __init__(self, specifiers: str = "", prereleases: bool | None = None) -> None:
+        super().__init__(specifiers, prereleases)
+        self.satisfiable = self._simplify()
+
+    def __and__(self, other: _SpecifierSet | str) -> SpecifierSet:
+        specifier = super().__and__(other)
+        merged = type(self)(prereleases=specifier._prereleases)
+        merged._specs = specifier._specs
+        merged.satisfiable = merged._simplify()
+        return merged
+
+    def _simplify(self) -> bool:
+        lowers: list[tuple[Version, Specifier]] = []
+        uppers: list[tuple[Version, Specifier]] = []
+        pins: list[tuple[Version, Specifier]] = []
+        excludes: dict[Version, Specifier] = {}
+        others: set[Specifier] = set()
+        for spec in self._specs:
+            if spec.operator in OTHER_OPERATORS or spec.version.endswith(".*"):
+                others.add(spec)
+                continue
+            version = Version(spec.version)
+            match spec.operator:
+                case ">" | ">=":
+                    lowers.append((version, spec))
+                case "<" | "<=":
+                    uppers.append((version, spec))
+                case "==":
+                    pins.append((version, spec))
+                case "!=":
+                    excludes.setdefault(version, spec)
+        # pins agree if one matches the others, it is the most specific since "==1.0"
+        # matches local versions such as "1.0+abc"
+        pin: Bound = None
+        if pins:
+            pin = next(
+                (
+                    (version, spec)
+                    for version, spec in sorted(
+                        pins, key=lambda pin: len(pin[1].version), reverse=True
+                    )
+                    if all(
+                        other.contains(version, prereleases=True) for _, other in pins
+                    )
+                ),
+                None,
+            )
+            if pin is None:
+                return False
+        lower = _strictest(lowers, ">")
+        upper = _strictest(uppers, "<")
+        bounds = [
+            spec
+            for bound, candidates in ((lower, lowers), (upper, uppers))
+            if bound is not None
+            for spec in _bounds(bound, candidates)
+        ]
+        if lower is not None and upper is not None:
+            if lower[0] > upper[0] or (
+                lower[0] == upper[0]
+                and (lower[1].operator == ">" or upper[1].operator == "<")
+            ):
+                return False
+            # ">=1,<=1" is "==1"
+            if lower[0] == upper[0] and pin is None:
+                pin = (lower[0], Specifier(f"=={lower[1].version}"))
+        if pin is not None:
+            if not all(
+                spec.contains(pin[0], prereleases=True)
+                for spec in (*bounds, *excludes.values(), *others)
+            ):
+                return False
+            self._set_specs(frozenset((pin[1],)))
+            return True
+        # drop exclusions that fall outside the bounds
+        self._set_specs(
+            frozenset(
+                (
+                    *bounds,
+                    *(
+                        spec
+                        for version, spec in excludes.items()
+                        if all(
+                            bound.contains(version, prereleases=True)
+                            for bound in bounds
+                        )
+                    ),
+                    *others,
+                )
+            )
+        )
+        return True
+
+    def _set_specs(self, specs: frozenset[Specifier]) -> None:
+        # a dropped specifier may be what allowed prereleases, e.g. ">=1.0a1" in
+        # ">=1.0a1,>=1.2", so that is kept explicitly
+        if (
+            self._prereleases is None
+            and any(spec.prereleases for spec in self._specs)
+            and not any(spec.prereleases for spec in specs)
+        ):
+            self._prereleases = True
+        self._specs = specs
+
+
+def _strictest(bounds: list[tuple[Version, Specifier]], exclusive: str) -> Bound:
+    # the greatest lower or least upper bound, exclusive before inclusive
+    strictest: Bound = None
+    for version, spec in bounds:
+        if (
+            strictest is None
+            or (version > strictest[0] if exclusive == ">" else version < strictest[0])
+            or (version == strictest[0] and spec.operator == exclusive)
+        ):
+            strictest = (version, spec)
+    return strictest
+
+
+def _excludes_release(version: Version, spec: Specifier) -> bool:
+    # under PEP 440 ">V" also excludes post-releases of V's release unless V is one,
+    # "<V" likewise pre-releases
+    return (spec.operator == ">" and not version.is_postrelease) or (
+        spec.operator == "<" and not version.is_prerelease
+    )
+
+
+def _bounds(
+    strictest: tuple[Version, Specifier], bounds: list[tuple[Version, Specifier]]
+) -> list[Specifier]:
+    # the strictest bound and, since it doesn't imply that, the strictest of those
+    # excluding post- or pre-releases of its release: ">1.0,>=1.0.post1" differs from
+    # ">=1.0.post1" by excluding 1.0.post1
+    version, spec = strictest
+    if _excludes_release(version, spec):
+        return [spec]
+    release = Version(version.base_version)
+    excluding = _strictest(
+        [
+            bound
+            for bound in bounds
+            if _excludes_release(*bound) and Version(bound[0].base_version) == release
+        ],
+        spec.operator[0],
+    )
+    return [spec] if excluding is None else [spec, excluding[1]]
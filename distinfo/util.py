@@ -9,20 +9,18 @@ import os
 import sys
 import tempfile
 import time
-from typing import TYPE_CHECKING, overload
-
-import aiofiles
-import atools
-import msgpack
-import yaml
-from box import Box
+from typing import TYPE_CHECKING, cast, overload
 
 from . import const
 
+# NOTE: format backends, aiofiles and atools are imported where used so that importing
+# this module, which everything does, stays cheap
+
 if TYPE_CHECKING:
     from collections.abc import Callable, Generator, Iterable
     from typing import IO, Any, Literal
 
+    import aiofiles.tempfile
     import anyio
 
 
@@ -115,9 +113,9 @@ def clean_dict(odict: dict, *, inplace: Literal[True]) -> None:
 
 
 def clean_dict(odict: dict, *, inplace: bool = False) -> dict | None:
+    # when not inplace the result is built as new plain dicts, lists and sets so the
+    # input is neither deep-copied first nor modified nor shared
     if not inplace:
-        if isinstance(odict, Box):
-            odict = odict.to_dict()
         clean = {}
     for key, value in list(odict.items()):
         if isinstance(value, dict):
@@ -126,14 +124,23 @@ def clean_dict(odict: dict, *, inplace: bool = False) -> dict | None:
             else:
                 value = clean_dict(value)
         elif isinstance(value, list):
-            for i, lvalue in enumerate(value):
-                if isinstance(lvalue, dict):
-                    if inplace:
+            if inplace:
+                for i, lvalue in enumerate(value):
+                    if isinstance(lvalue, dict):
                         clean_dict(lvalue, inplace=True)
-                    else:
-                        lvalue = value[i] = clean_dict(lvalue)
-                if not lvalue:
-                    del value[i]
+                    if not lvalue:
+                        del value[i]
+            else:
+                value = [
+                    lvalue
+                    for lvalue in (
+                        clean_dict(lvalue) if isinstance(lvalue, dict) else lvalue
+                        for lvalue in value
+                    )
+                    if lvalue
+                ]
+        elif isinstance(value, set) and not inplace:
+            value = set(value)
         keep = value or isinstance(value, int | float)
         if inplace and not keep:
             del odict[key]
@@ -146,29 +153,6 @@ def clean_dict(odict: dict, *, inplace: bool = False) -> dict | None:
 BASE_TYPES = (float, int, str, tuple)
 
 
-def dump_dict(odict: dict, *, stringify: bool = False) -> dict:
-    clean = type(odict)()
-    for key, value in odict.items():
-        if isinstance(value, dict):
-            value = dump_dict(value, stringify=stringify)
-        elif isinstance(value, list | set | tuple):
-            if isinstance(value, set):
-                value = sorted_lc(value)
-            if stringify:
-                value = [
-                    dump_dict(v, stringify=stringify)
-                    if isinstance(v, dict)
-                    else v
-                    if isinstance(v, BASE_TYPES)
-                    else str(v)
-                    for v in value
-                ]
-        elif stringify and not isinstance(value, BASE_TYPES):
-            value = str(value)
-        clean[key] = value
-    return clean
-
-
 def list_to_set(odict: dict) -> dict:
     clean = type(odict)()
     # convert lists to sets from msgpack-serialized data
@@ -185,21 +169,117 @@ def list_to_set(odict: dict) -> dict:
     return clean
 
 
+def _prepare(obj: Any, *, clean: bool, sort: bool, stringify: bool) -> Any:
+    """Clean, sort and stringify a dict for dumping in a single recursive pass
+
+    Cleaning is as `clean_dict` without building the intermediate copy, stringifying
+    converts values that aren't `BASE_TYPES` to str, and sets become lists, sorted only
+    if `sort` since ordering is of no use to machine consumers.
+    """
+    prepared = {}
+    for key, value in obj.items():
+        if isinstance(value, dict):
+            value = _prepare(value, clean=clean, sort=sort, stringify=stringify)
+        elif isinstance(value, list | set | tuple):
+            drop_empty = clean and isinstance(value, list)
+            if isinstance(value, set):
+                value = sorted_lc(value) if sort else list(value)
+            value = [
+                _prepare(v, clean=clean, sort=sort, stringify=stringify)
+                if isinstance(v, dict)
+                else v
+                if not stringify or isinstance(v, BASE_TYPES)
+                else str(v)
+                for v in value
+            ]
+            if drop_empty:
+                value = [v for v in value if v]
+        elif clean and not (value or isinstance(value, int | float)):
+            continue
+        elif stringify and not isinstance(value, BASE_TYPES):
+            value = str(value)
+        if not clean or value or isinstance(value, int | float):
+            prepared[key] = value
+    return prepared
+
+
+# human-readable formats, these are sorted by default
+SORTED_FORMATS = ("json", "yaml")
+
+# formats whose encoder renders sets and other objects itself so need no stringify
+NATIVE_FORMATS = ("json-fast",)
+
+# formats written to a binary stream
+BINARY_FORMATS = ("json-fast", "msgpack")
+
+
 def _dump(
     obj: Any,
-    dumper: Callable,
+    fmt: str,
+    dumpers: dict[str, Callable],
     *args: Any,
-    stringify: bool = True,
+    stringify: bool | None = None,
+    clean: bool = True,
+    sort: bool | None = None,
     **kwargs: Any,
 ) -> bytes | str:
+    if sort is None:
+        sort = fmt in SORTED_FORMATS
+    if stringify is None:
+        stringify = fmt not in NATIVE_FORMATS
     if isinstance(obj, dict):  # pragma: no branch
-        obj = dump_dict(clean_dict(obj), stringify=stringify)
-    return dumper(obj, *args, **kwargs)
+        # clean=False skips cleaning for input that is already clean, e.g. the output of
+        # `Distribution.to_dict`
+        obj = _prepare(obj, clean=clean, sort=sort, stringify=stringify)
+    if fmt != "msgpack":
+        kwargs.setdefault("sort_keys", sort)
+    return dumpers[fmt](obj, *args, **kwargs)
+
+
+def _msgpack_dump(obj: Any, stream: IO) -> None:
+    import msgpack
+
+    # write a dict item by item rather than packing the whole thing to one buffer
+    packer = msgpack.Packer()
+    if isinstance(obj, dict):
+        stream.write(packer.pack_map_header(len(obj)))
+        for key, value in obj.items():
+            stream.write(packer.pack(key))
+            stream.write(packer.pack(value))
+    else:
+        stream.write(packer.pack(obj))
+
+
+def _msgpack_dumps(obj: Any) -> bytes:
+    import msgpack
+
+    return msgpack.packb(obj)
 
 
-_yaml_load = functools.partial(yaml.load, Loader=yaml.CLoader)
+def _msgpack_load(stream: IO, **kwargs: Any) -> Any:
+    import msgpack
 
-_yaml_dump = functools.partial(yaml.dump, Dumper=yaml.CDumper, default_flow_style=False)
+    return msgpack.unpack(stream, **kwargs)
+
+
+def _msgpack_loads(value: bytes, **kwargs: Any) -> Any:
+    import msgpack
+
+    return msgpack.unpackb(value, **kwargs)
+
+
+def _yaml_load(stream: IO | str, **kwargs: Any) -> Any:
+    import yaml
+
+    return yaml.load(stream, Loader=yaml.CLoader, **kwargs)
+
+
+def _yaml_dump(obj: Any, *args: Any, **kwargs: Any) -> str | None:
+    import yaml
+
+    return yaml.dump(
+        obj, *args, Dumper=yaml.CDumper, default_flow_style=False, **kwargs
+    )
 
 
 def _yaml_dumps(obj: Any, *args: Any, **kwargs: Any) -> str:
@@ -208,31 +288,110 @@ def _yaml_dumps(obj: Any, *args: Any, **kwargs: Any) -> str:
     return stream.getvalue()
 
 
+def _fast_default(obj: Any) -> Any:
+    # called by the fast json encoders for types they don't encode natively
+    if isinstance(obj, set | frozenset):
+        return list(obj)
+    return str(obj)
+
+
+@functools.cache
+def _json_fast() -> tuple[Callable[..., bytes], Callable[[bytes | str], Any]]:
+    # pick the backend for the "json-fast" format on first use: orjson, msgspec then
+    # stdlib, returns (dumpb, loads)
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover
+        pass
+    else:
+        # datetime and dataclasses (e.g. `Requirement`) pass through to `_fast_default`
+        # so output matches the "json" format
+        option = (
+            orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_NON_STR_KEYS
+        )
+
+        def orjson_dumpb(obj: Any, *, sort_keys: bool = False) -> bytes:
+            return orjson.dumps(
+                obj,
+                default=_fast_default,
+                option=option | orjson.OPT_SORT_KEYS if sort_keys else option,
+            )
+
+        return orjson_dumpb, orjson.loads
+
+    try:  # pragma: no cover
+        import msgspec
+    except ImportError:  # pragma: no cover
+        pass
+    else:  # pragma: no cover
+        # encoders are built once, msgspec encodes sets natively
+        encoders = {
+            sort_keys: msgspec.json.Encoder(
+                enc_hook=_fast_default, order="sorted" if sort_keys else None
+            )
+            for sort_keys in (False, True)
+        }
+
+        def msgspec_dumpb(obj: Any, *, sort_keys: bool = False) -> bytes:
+            return encoders[sort_keys].encode(obj)
+
+        return msgspec_dumpb, msgspec.json.decode
+
+    def json_dumpb(obj: Any, *, sort_keys: bool = False) -> bytes:  # pragma: no cover
+        return json.dumps(
+            obj, default=_fast_default, separators=(",", ":"), sort_keys=sort_keys
+        ).encode()
+
+    return json_dumpb, json.loads  # pragma: no cover
+
+
+def _json_fast_dump(obj: Any, stream: IO, **kwargs: Any) -> None:
+    stream.write(_json_fast()[0](obj, **kwargs))
+
+
+def _json_fast_dumps(obj: Any, **kwargs: Any) -> str:
+    return _json_fast()[0](obj, **kwargs).decode()
+
+
+def _json_fast_load(stream: IO) -> Any:
+    return _json_fast()[1](stream.read())
+
+
+def _json_fast_loads(value: bytes | str) -> Any:
+    return _json_fast()[1](value)
+
+
 DEFAULT_DUMPER = "yaml"
 
-JSON_DEFAULTS = dict(default=str, indent=2, sort_keys=True)
+JSON_DEFAULTS: dict[str, Any] = dict(default=str, indent=2)
 
-DUMPERS = dict(
+DUMPERS: dict[str, Callable[..., Any]] = dict(
     json=functools.partial(json.dump, **JSON_DEFAULTS),
-    msgpack=msgpack.pack,
+    **{"json-fast": _json_fast_dump},
+    msgpack=_msgpack_dump,
     yaml=_yaml_dump,
 )
 
-LOADERS = dict(
+LOADERS: dict[str, Callable[..., Any]] = dict(
     json=json.load,
-    msgpack=msgpack.unpack,
+    **{"json-fast": _json_fast_load},
+    msgpack=_msgpack_load,
     yaml=_yaml_load,
 )
 
-STR_DUMPERS: dict[str, Callable] = dict(
+STR_DUMPERS: dict[str, Callable[..., Any]] = dict(
     json=functools.partial(json.dumps, **JSON_DEFAULTS),
-    msgpack=msgpack.packb,
+    **{"json-fast": _json_fast_dumps},
+    msgpack=_msgpack_dumps,
     yaml=_yaml_dumps,
 )
 
-STR_LOADERS = dict(
+STR_LOADERS: dict[str, Callable[..., Any]] = dict(
     json=json.loads,
-    msgpack=msgpack.unpackb,
+    **{"json-fast": _json_fast_loads},
+    msgpack=_msgpack_loads,
     yaml=_yaml_load,
 )
 
@@ -242,7 +401,7 @@ def dump(
 ) -> None:
     if hasattr(obj, "to_dict"):
         obj = obj.to_dict()
-    _dump(obj, DUMPERS[fmt], file, **kwargs)
+    _dump(obj, fmt, DUMPERS, file, **kwargs)
 
 
 def load(file: IO = sys.stdin, fmt: str = DEFAULT_DUMPER, **kwargs: Any) -> Any:
@@ -255,7 +414,9 @@ def dumps(obj: Any) -> str:
 
 
 @overload
-def dumps(obj: Any, fmt: Literal["json"] | Literal["yaml"]) -> str:
+def dumps(
+    obj: Any, fmt: Literal["json"] | Literal["json-fast"] | Literal["yaml"]
+) -> str:
     ...
 
 
@@ -265,16 +426,24 @@ def dumps(obj: Any, fmt: Literal["msgpack"]) -> bytes:
 
 
 def dumps(obj: Any, fmt: str = DEFAULT_DUMPER, **kwargs: Any) -> bytes | str:
-    return _dump(obj, STR_DUMPERS[fmt], **kwargs).strip()
+    return _dump(obj, fmt, STR_DUMPERS, **kwargs).strip()
 
 
 def loads(value: bytes | str, fmt: str = DEFAULT_DUMPER, **kwargs: Any) -> dict:
     return STR_LOADERS[fmt](value, **kwargs)
 
 
+@functools.cache
+def levelno(level: str) -> int:
+    """Level number for a logger method name, e.g. "spam" or "exception" """
+    if level == "exception":
+        return logging.ERROR
+    return cast(int, logging.getLevelName(level.upper()))
+
+
 @contextlib.contextmanager
 def log_duration(
-    msg: str,
+    msg: Callable | str,
     end_msg: Callable | str | None = None,
     *,
     logger: logging.Logger = log,
@@ -282,11 +451,19 @@ def log_duration(
     end_level: str | None = None,
     stacklevel: int = 0,
 ) -> Generator[None, None, None]:
+    end_level = end_level or level
+    if not (
+        logger.isEnabledFor(levelno(level)) or logger.isEnabledFor(levelno(end_level))
+    ):
+        yield
+        return
     stacklevel += 2
+    if callable(msg):
+        msg = msg()
     start = time.monotonic()
     getattr(logger, level)(msg, stacklevel=stacklevel)
     yield
-    getattr(logger, end_level or level)(
+    getattr(logger, end_level)(
         f"{end_msg() if callable(end_msg) else end_msg if end_msg is not None else msg} "
         f"in {time.monotonic() - start:.4f}s",
         stacklevel=stacklevel,
@@ -299,6 +476,8 @@ TMPDIR_PREFIX = f"{const.NAME}-"
 def tmpdir(
     **kwargs: Any,
 ) -> aiofiles.tempfile.AiofilesContextManagerTempDir:
+    import aiofiles.tempfile
+
     kwargs["prefix"] = TMPDIR_PREFIX
     return aiofiles.tempfile.TemporaryDirectory(**kwargs)
 
@@ -309,8 +488,23 @@ def is_tmpdir(path: anyio.Path) -> bool:
 
 # functools.cached_property is broken: https://github.com/python/cpython/issues/87634
 class cached_property(property):  # noqa: N801
+    # the memoized getter is built on first access since atools imports asyncio and
+    # `Base.log` is defined with this at import time
     def __init__(self, fget: Callable[[Any], Any]) -> None:
-        super().__init__(atools.memoize(fget, keygen=lambda self: (id(self),)))
+        super().__init__(self._get)
+        self._func = fget
+        self._memoized: Callable[[Any], Any] | None = None
+
+    @property
+    def fget(self) -> Callable[[Any], Any]:  # type: ignore[override]
+        if self._memoized is None:
+            import atools
+
+            self._memoized = atools.memoize(self._func, keygen=lambda self: (id(self),))
+        return self._memoized
+
+    def _get(self, obj: Any) -> Any:
+        return self.fget(obj)
 
     def __delete__(self, obj: Any) -> None:
         memoized = self.fget.memoize  # type: ignore[attr-defined]
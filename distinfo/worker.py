@@ -0,0 +1,77 @@
+"""Entry point for dirty collectors run in a subprocess: `python -m distinfo.worker`
+
+Reads a `protocol` request from stdin, runs the collector and writes the result to
+stdout. It skips the CLI and `logconfig` so it imports neither click nor coloredlogs,
+and it keeps the last `LOG_CAPACITY` log records at the level in the request.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+from collections import deque
+from typing import TYPE_CHECKING
+
+import anyio
+
+from . import protocol
+from .collector import DistCollector
+
+if TYPE_CHECKING:
+    from .protocol import LogTupleType
+
+# noisy setup.py scripts can log a lot, past this the oldest records are dropped
+LOG_CAPACITY = 1000
+
+
+class RingHandler(logging.Handler):
+    """Keeps the last `capacity` records as `protocol` log tuples"""
+
+    def __init__(self, capacity: int = LOG_CAPACITY) -> None:
+        super().__init__()
+        self.buffer: deque[LogTupleType] = deque(maxlen=capacity)
+        self.emitted = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.buffer.append((record.levelno, record.name, record.getMessage()))
+        except Exception:  # pragma: no cover
+            self.handleError(record)
+        self.emitted += 1
+
+    @property
+    def records(self) -> list[LogTupleType]:
+        records = list(self.buffer)
+        if dropped := self.emitted - len(records):
+            records.insert(
+                0, (logging.WARNING, __name__, f"dropped {dropped} earlier log records")
+            )
+        return records
+
+
+async def run(data: bytes) -> bytes:
+    request = protocol.load_request(data)
+    logging.captureWarnings(capture=True)
+    handler = RingHandler()
+    logging.root.handlers = [handler]
+    logging.root.setLevel(request.level)
+    dist = await DistCollector.from_dir(
+        anyio.Path(request.path),
+        request.files,
+        collector=request.collector,
+        options=request.options,
+        **request.kwargs,
+    )
+    return protocol.dump_result(
+        dist, dist.ext.collectors.pop(request.collector), handler.records
+    )
+
+
+def main() -> None:
+    result = anyio.run(run, sys.stdin.buffer.read())
+    # look up stdout after the run since collectors may replace it
+    sys.stdout.buffer.write(result)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
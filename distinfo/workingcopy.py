@@ -0,0 +1,202 @@
+"""Working copies of source trees for dirty collectors to write to
+
+`materialise` recreates a tree file by file using the first strategy the filesystem
+supports, falling back to the next when one fails:
+
+    reflink:  a copy-on-write clone sharing data with the original, e.g. btrfs and xfs
+    hardlink: a hard link to the original, `copy_on_write` keeps writes off it
+    copy:     a full copy
+
+Tool caches and virtualenvs, `SKIP_DIRS`, aren't materialised, setup.py has no business
+with those. VCS directories are since e.g. setuptools_scm reads them.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import shutil
+import stat
+import sys
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Sequence
+
+log = logging.getLogger(__name__)
+
+STRATEGIES = ("reflink", "hardlink", "copy")
+
+SKIP_DIRS = frozenset(
+    (
+        "__pycache__",
+        ".mypy_cache",
+        ".nox",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".tox",
+        ".venv",
+        "node_modules",
+    )
+)
+
+# linux ioctl to clone a file, _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+# audit events that may change a file in place, other than "open" for writing
+CHANGE_EVENTS = frozenset(("os.chmod", "os.chown", "os.truncate", "os.utime"))
+
+# audit events that start a process, which `copy_on_write` can't follow
+SPAWN_EVENTS = frozenset(
+    ("os.exec", "os.posix_spawn", "os.spawn", "os.system", "subprocess.Popen")
+)
+
+# roots of hard-linked working copies, guarded by `copy_on_write`
+_roots: list[str] = []
+
+_audit_hooked = False
+
+# set while the audit hook breaks a link so its own file operations are ignored
+_local = threading.local()
+
+
+def materialise(
+    src: str, dst: str, strategies: Sequence[str] = STRATEGIES
+) -> list[str]:
+    """Recreate the tree at src as dst, returns the strategies used"""
+    used: list[str] = []
+    _materialise(src, dst, list(strategies), used)
+    return used
+
+
+def _materialise(src: str, dst: str, strategies: list[str], used: list[str]) -> None:
+    os.mkdir(dst)
+    with os.scandir(src) as entries:
+        for entry in entries:
+            target = os.path.join(dst, entry.name)
+            if entry.is_symlink():
+                os.symlink(os.readlink(entry.path), target)
+            elif entry.is_dir():
+                if entry.name not in SKIP_DIRS:
+                    _materialise(entry.path, target, strategies, used)
+            # sockets, fifos and the like are skipped
+            elif entry.is_file():
+                _materialise_file(entry, target, strategies, used)
+
+
+def _materialise_file(
+    entry: os.DirEntry, dst: str, strategies: list[str], used: list[str]
+) -> None:
+    while True:
+        strategy = strategies[0]
+        try:
+            if strategy == "hardlink":
+                os.link(entry.path, dst)
+            else:
+                if strategy == "reflink":
+                    _reflink(entry.path, dst)
+                else:
+                    shutil.copyfile(entry.path, dst)
+                # as `cp --archive` plus `chmod u+w`
+                st = entry.stat()
+                os.chmod(dst, stat.S_IMODE(st.st_mode) | stat.S_IWUSR)
+                os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+        except OSError as exc:
+            if len(strategies) == 1:
+                raise
+            log.debug(f"{strategy} fail: {exc}")
+            strategies.pop(0)
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(dst)
+        else:
+            break
+    if strategy not in used:
+        used.append(strategy)
+
+
+def _reflink(src: str, dst: str) -> None:
+    # raises OSError where unsupported, fcntl is unix only
+    import fcntl
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+
+
+@contextlib.contextmanager
+def copy_on_write(root: str) -> Generator[None, None, None]:
+    """Keep writes in this process to a hard-linked working copy off the original
+
+    An audit hook, installed on first use since it can't be removed, replaces a linked
+    file under root by a copy before it is opened for writing or its attributes are
+    changed. Other processes can't be followed so before one is started every link is
+    replaced.
+    """
+    global _audit_hooked
+    if not _audit_hooked:
+        sys.addaudithook(_audit_hook)
+        _audit_hooked = True
+    # paths are compared real since setup.py may open them relative to a real cwd
+    root = os.path.realpath(root)
+    _roots.append(root)
+    try:
+        yield
+    finally:
+        with contextlib.suppress(ValueError):
+            _roots.remove(root)
+
+
+def _audit_hook(event: str, args: tuple) -> None:
+    # called for every audited event so returns as soon as possible
+    if not _roots or getattr(_local, "busy", False):
+        return
+    if event == "open":
+        path, _mode, flags = args
+        if not flags & (os.O_WRONLY | os.O_RDWR):
+            return
+    elif event in CHANGE_EVENTS:
+        path = args[0]
+    elif event in SPAWN_EVENTS:
+        _local.busy = True
+        try:
+            for root in list(_roots):
+                log.debug(f"{event}: unlink working copy {root}")
+                _unlink_tree(root)
+                _roots.remove(root)
+        finally:
+            _local.busy = False
+        return
+    else:
+        return
+    # file descriptors are already open
+    if isinstance(path, int):
+        return
+    head, tail = os.path.split(os.path.abspath(os.fsdecode(path)))
+    path = os.path.join(os.path.realpath(head), tail)
+    if any(path.startswith(f"{root}{os.sep}") for root in _roots):
+        _local.busy = True
+        try:
+            _unlink(path)
+        finally:
+            _local.busy = False
+
+
+def _unlink_tree(root: str) -> None:
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in filenames:
+            _unlink(os.path.join(dirpath, name))
+
+
+def _unlink(path: str) -> None:
+    # replace a hard link with a copy
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISREG(st.st_mode) or st.st_nlink < 2:
+        return
+    tmp = f"{path}.{os.getpid()}.cow"
+    shutil.copy2(path, tmp)
+    os.chmod(tmp, stat.S_IMODE(st.st_mode) | stat.S_IWUSR)
+    os.replace(tmp, path)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import subprocess
+import sys
 from typing import TYPE_CHECKING
 
 import anyio
@@ -8,7 +10,7 @@ from box import Box
 from click.testing import CliRunner
 from setuptools import sandbox
 
-from distinfo import cli, const, util
+from distinfo import cli, util
 
 from ..functional.cases import Case
 from ..functional.test_pyprojectmetadata import PYPROJECT
@@ -59,16 +61,6 @@ class TestCli(Case):
         assert dist.name == "aaa"
         assert dist.ext.x == "1"
 
-    def test_extract_single_collector(self, tmpdir: local) -> None:
-        dist = self._invoke(
-            "--set=ext.build_backend:setuptools.build_meta",
-            "--collector=PyProjectDynamicMetadata",
-            tmpdir=tmpdir,
-            assert_dist=False,
-            input=util.dumps([const.PYPROJECT_TOML], fmt="msgpack"),
-        )
-        assert dist.name == "xxx"
-
     def test_extract_no_such(self) -> None:
         result = CliRunner().invoke(cli._main, ("/no/such/path",))
         assert result.exit_code == 2
@@ -89,6 +81,34 @@ class TestCli(Case):
             "bbb; extra == 'dev'",
         }
 
+    def test_explain(self, tmpdir: local) -> None:
+        plan = self._invoke("--explain", tmpdir=tmpdir, assert_dist=False)
+        # roots first, then ordered by priority
+        assert list(plan)[:3] == ["Cargo", "FindTests", "PyProjectMetadata"]
+        assert plan.Cargo == set()
+        assert plan.SetuptoolsMetadata == {
+            "FindTests",
+            "PyProjectDynamicMetadata",
+            "PyProjectMetadata",
+        }
+        # both produce ext.packages but run alongside
+        assert "PathMetadata" not in plan.FindPkgs
+        # collectors producing only ext keys are pruned
+        plan = self._invoke(
+            "--explain", "--include=name", tmpdir=tmpdir, assert_dist=False
+        )
+        assert set(plan) == {
+            "PathMetadata",
+            "PyProjectDynamicMetadata",
+            "PyProjectMetadata",
+            "SetuptoolsMetadata",
+        }
+        assert plan.PathMetadata == {
+            "PyProjectDynamicMetadata",
+            "PyProjectMetadata",
+            "SetuptoolsMetadata",
+        }
+
     def test_as_module(self, tmpdir: local, capsys: pytest.CaptureFixture) -> None:
         self._write_pyproject(tmpdir, PYPROJECT)
         main = str(anyio.Path(cli.__file__).parent / "__main__.py")
@@ -101,3 +121,21 @@ class TestCli(Case):
             )
         dist = Box(util.list_to_set(util.loads(capsys.readouterr().out, fmt="json")))
         self._assert_dist(dist)
+
+    @pytest.mark.parametrize("fmt", ["json", "msgpack"])
+    def test_extract_setup_py(self, tmpdir: local, fmt: str) -> None:
+        # in a subprocess since running setup.py in-process redirects the real stdout
+        self._write_setup(
+            tmpdir,
+            "from setuptools import setup\n"
+            "setup(name='xxx', version='1', install_requires=['aaa'])\n",
+        )
+        out = subprocess.run(
+            (sys.executable, "-m", "distinfo", f"--format={fmt}", str(tmpdir)),
+            capture_output=True,
+            check=True,
+        ).stdout
+        dist = Box(util.list_to_set(util.loads(out, fmt=fmt)))
+        assert dist.name == "xxx"
+        assert dist.version == "1"
+        assert dist.requires.run == {"aaa"}
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from ..cases import Case
+
+# budgets are for total import time in microseconds, they are generous since this runs
+# on loaded CI machines - the point is to catch a heavy import creeping in rather than to
+# measure
+IMPORT_BUDGETS = {
+    "import distinfo": 100_000,
+    "from distinfo import Requirement": 250_000,
+    "import distinfo.worker": 1_000_000,
+}
+
+# modules that must not be imported by each statement
+NOT_IMPORTED = {
+    "import distinfo": (
+        "anyio",
+        "box",
+        "distinfo.collector",
+        "msgpack",
+        "packaging",
+        "yaml",
+    ),
+    "from distinfo import Requirement": (
+        "aiofiles",
+        "anyio",
+        "asyncio",
+        "box",
+        "distinfo.collector",
+        "msgpack",
+        "yaml",
+    ),
+    # imported by the cli but not needed to run a collector
+    "import distinfo.worker": (
+        "click",
+        "coloredlogs",
+        "distinfo.cli",
+        "distinfo.logconfig",
+    ),
+}
+
+
+def importtime(statement: str) -> dict[str, int]:
+    # cumulative time of each top-level import by module name
+    stderr = subprocess.run(
+        (sys.executable, "-X", "importtime", "-c", statement),
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stderr
+    imports = {}
+    for line in stderr.splitlines()[1:]:
+        _self, cumulative, name = line.removeprefix("import time:").split("|")
+        imports[name.strip()] = int(cumulative) if not name.startswith("  ") else 0
+    return imports
+
+
+class TestImportTime(Case):
+    @pytest.mark.parametrize("statement", IMPORT_BUDGETS)
+    def test_importtime(self, statement: str) -> None:
+        imports = importtime(statement)
+        assert not set(NOT_IMPORTED[statement]) & set(imports)
+        # modules imported at interpreter startup are not counted, this also avoids
+        # relying on the entry for the imported module since modules imported with
+        # `importlib.import_module` have none
+        startup = importtime("pass")
+        assert (
+            sum(t for name, t in imports.items() if name not in startup)
+            < IMPORT_BUDGETS[statement]
+        )
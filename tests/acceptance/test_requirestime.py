@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import anyio
+from packaging.requirements import Requirement as PackagingRequirement
+
+from distinfo.distribution import Distribution
+
+from ..cases import Case
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import Any
+
+# distinct requirements with specifiers, extras and markers, as a large requires_dist
+REQSTRS = tuple(
+    f"pkg{i}[x]>={i % 7}.0,<{i % 7 + 1}; python_version >= '3.{i % 12}'"
+    for i in range(400)
+)
+
+# parsing into a `Distribution` may take this many times packaging's parser alone, it is
+# generous since this runs on loaded CI machines - the point is to catch per-requirement
+# overhead creeping back in rather than to measure
+OVERHEAD_BUDGET = 5
+
+RUNS = 5
+
+
+def best_of(func: Callable[[], Any], runs: int = RUNS) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def requirestime(reqstrs: tuple[str, ...] = REQSTRS, runs: int = RUNS) -> float:
+    """Best time to update a `Distribution` with reqstrs then add them again
+
+    This works on any revision with async `Distribution.factory`, `update` and
+    `add_requirements`. To compare before and after a change, copy this module into
+    each checkout and run `python -c` on `requirestime()` from the checkout's root.
+    """
+
+    async def run() -> None:
+        dist = await Distribution.factory()
+        await dist.update(dict(requires_dist=list(reqstrs)))
+        await dist.add_requirements("run", *reqstrs)
+
+    return best_of(lambda: anyio.run(run), runs)
+
+
+class TestRequiresTime(Case):
+    def test_requirestime(self) -> None:
+        floor = best_of(lambda: [PackagingRequirement(reqstr) for reqstr in REQSTRS])
+        # each reqstr is parsed twice
+        assert requirestime() < floor * 2 * OVERHEAD_BUDGET
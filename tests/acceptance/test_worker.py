@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import logging
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+from distinfo import const, protocol
+
+from ..functional.cases import Case
+from ..functional.test_pyprojectmetadata import PYPROJECT
+
+if TYPE_CHECKING:
+    from py.path import local
+
+
+class TestWorker(Case):
+    def test_run(self, tmpdir: local) -> None:
+        self._write_pyproject(tmpdir, PYPROJECT)
+        out = subprocess.run(
+            (sys.executable, "-m", "distinfo.worker"),
+            input=protocol.dump_request(
+                protocol.Request(
+                    path=str(tmpdir),
+                    files=[const.PYPROJECT_TOML],
+                    collector="PyProjectDynamicMetadata",
+                    options=dict(modify_globals=True),
+                    kwargs=dict(ext=dict(build_backend="setuptools.build_meta")),
+                    level=logging.DEBUG,
+                )
+            ),
+            capture_output=True,
+            check=True,
+        ).stdout
+        result, fields, requires, records = protocol.load_result(out)
+        assert result
+        assert fields["name"] == "xxx"
+        assert requires["dev"] == ["bbb"]
+        assert records
@@ -2,7 +2,13 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, cast
 
-from distinfo.collector import PyProjectDynamicMetadata, PyProjectMetadata
+import anyio
+
+from distinfo.collector import (
+    DistCollector,
+    PyProjectDynamicMetadata,
+    PyProjectMetadata,
+)
 
 from .cases import Case
 
@@ -41,6 +47,16 @@ requires=["yyy"]
 aaa = ["bbb"]
 """
 
+PYPROJECT_FLIT_DYNAMIC = """
+[build-system]
+requires = ["flit-core"]
+build-backend = "flit_core.buildapi"
+
+[project]
+name = "aaa"
+dynamic = ["description", "version"]
+"""
+
 
 class TestPyProjectDynamicMetadata(Case):
     collector = PyProjectDynamicMetadata
@@ -85,3 +101,16 @@ class TestPyProjectDynamicMetadata(Case):
         assert collector.dist.name == "aaa"
         assert requires.run == {"yyy"}
         assert requires.aaa == {"bbb"}
+
+    async def test_collect_included(self, tmpdir: local) -> None:
+        self._write_pyproject(tmpdir, PYPROJECT_FLIT_DYNAMIC)
+        self._write_package(tmpdir, "aaa", content='"""x"""\n__version__="1"')
+        path = anyio.Path(tmpdir)
+        # dynamic is kept though excluded so included dynamic keys are collected
+        dist = await DistCollector.from_dir(
+            path,
+            await DistCollector._find_files(path),
+            options=dict(include=("version",)),
+        )
+        assert dist.version == "1"
+        assert dist.to_dict() == dict(version="1")
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+import anyio
 from box import Box
 from setuptools import sandbox
 from setuptools.dist import Distribution as SetuptoolsDistribution
 
 from distinfo import Requires, const
-from distinfo.collector import SetuptoolsMetadata
+from distinfo.collector import DistCollector, SetuptoolsMetadata
 
 from .cases import Case
 
@@ -119,6 +120,63 @@ class TestSetuptoolsMetadata(Case):
         )
         assert collector.dist.home_page is None
 
+    async def test_collect_filled(self, tmpdir: local) -> None:
+        self._basic_setup(tmpdir)
+        self._write_setup(tmpdir, SETUP_PY)
+        self._write_pyproject(tmpdir)
+        path = anyio.Path(tmpdir)
+        files = await DistCollector._find_files(path)
+        # pyproject fills name and version so setup.py isn't run
+        dist = await DistCollector.from_dir(
+            path, files, options=dict(include=("name", "version"))
+        )
+        assert dist.version == "1"
+        assert "SetuptoolsMetadata" not in dist.ext.collectors
+        # requires accumulates so is never filled
+        dist = await DistCollector.from_dir(
+            path, files, options=dict(include=("name", "requires"))
+        )
+        assert dist.ext.collectors.SetuptoolsMetadata
+        assert dist.requires.run
+
+    async def test_collect_deadline(self, tmpdir: local) -> None:
+        self._write_setup(tmpdir, "__import__('time').sleep(60)")
+        tmpdir.join("PKG-INFO").write("Metadata-Version: 2.1\nName: xxx\nVersion: 1\n")
+        path = anyio.Path(tmpdir)
+        started = anyio.current_time()
+        dist = await DistCollector.from_dir(
+            path, await DistCollector._find_files(path), options=dict(deadline=0.5)
+        )
+        assert anyio.current_time() - started < 30
+        # only those cut off mid-run are marked, not those reached after the deadline
+        # or never wanted
+        assert dist.ext.collectors == dict(
+            SetuptoolsMetadata=DistCollector.DEADLINE, PathMetadata=True
+        )
+        # cheap collectors still run
+        assert dist.version == "1"
+
+    async def test_collect_timeout(self, tmpdir: local) -> None:
+        self._write_setup(tmpdir, "__import__('time').sleep(60)")
+        collector, _requires = await self._collect(
+            tmpdir,
+            fail=True,
+            options=dict(timeouts=dict(SetuptoolsMetadata=0.5)),
+        )
+        assert collector.dist.ext.collectors.SetuptoolsMetadata == collector.TIMED_OUT
+
+    async def test_collect_network_denied(
+        self, tmpdir: local, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        # explicitly fetched setup_requires fail rather than run pip
+        self._write_setup(
+            tmpdir,
+            "from setuptools.dist import Distribution\n"
+            "Distribution().fetch_build_eggs(['xxx'])\n",
+        )
+        await self._collect(tmpdir, fail=True)
+        assert "denied network access: running" in caplog.text
+
     async def test_collect_setup_cfg_only(self, tmpdir: local) -> None:
         self._basic_setup(tmpdir)
         tmpdir.join(const.SETUP_CFG).write(SETUP_CFG)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+
+import anyio
+import pytest
+
+from distinfo import command
+
+from ..cases import Case
+
+if TYPE_CHECKING:
+    from py.path import local
+
+
+class TestCommand(Case):
+    async def test_stream(self) -> None:
+        async with command.stream("printf", "a\\nb\\n\\nc") as lines:
+            assert [line async for line in lines] == ["a", "b", "c"]
+
+    async def test_stream_null(self) -> None:
+        async with command.stream("printf", "a b\\0\\0c\\nd\\0", null=True) as lines:
+            assert [line async for line in lines] == ["a b", "c\nd"]
+
+    async def test_stream_batch(self) -> None:
+        async with command.stream("printf", "a\\nb\\nc", batch=True) as batches:
+            assert [line async for lines in batches for line in lines] == [
+                "a",
+                "b",
+                "c",
+            ]
+
+    async def test_stream_early_exit(self) -> None:
+        # more than a pipe buffer so the process would block if not drained
+        async with command.stream(
+            sys.executable, "-c", "print('x\\n' * 100_000)"
+        ) as lines:
+            async for line in lines:
+                assert line == "x"
+                break
+
+    async def test_stream_fail(self) -> None:
+        with pytest.raises(command.CalledProcessError) as exc_info:
+            async with command.stream(
+                sys.executable, "-c", "import sys; print('a'); sys.exit('bad')"
+            ) as lines:
+                assert [line async for line in lines] == ["a"]
+        assert exc_info.value.returncode == 1
+        assert exc_info.value.stderr == "bad"
+
+    async def test_run_timeout(self, tmpdir: local) -> None:
+        pidfile = tmpdir.join("pid")
+        with pytest.raises(command.TimeoutExpired):
+            await command.run(
+                "sh", "-c", f"sleep 60 & echo $! > {pidfile}; wait", timeout=0.5
+            )
+        # the process group is killed, not just the process
+        stat = anyio.Path(f"/proc/{pidfile.read().strip()}/stat")
+        await anyio.sleep(0.1)
+        assert not await stat.exists() or (await stat.read_text()).split()[2] == "Z"
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import logging
 from typing import TYPE_CHECKING
+from unittest.mock import Mock
 
 from distinfo.base import Base
 
@@ -35,3 +37,25 @@ class TestBase(Case):
         with impl.log.duration("yyy"):
             pass
         assert "yyy in" in caplog.text
+
+    def test_log_disabled(self, caplog: pytest.LogCaptureFixture) -> None:
+        class ReprImpl(BaseImpl):
+            reprs = 0
+
+            def __repr__(self) -> str:
+                type(self).reprs += 1
+                return super().__repr__()
+
+        impl = ReprImpl("xxx")
+        msg = Mock(return_value="yyy")
+        with caplog.at_level(logging.INFO, logger=impl.log._logger.name):
+            impl.log.debug(msg)
+            with impl.log.duration(msg):
+                pass
+            msg.assert_not_called()
+            assert ReprImpl.reprs == 0
+            assert not caplog.text
+            impl.log.info(msg)
+        msg.assert_called_once_with()
+        assert ReprImpl.reprs == 1
+        assert "<ReprImpl xxx>: yyy" in caplog.text
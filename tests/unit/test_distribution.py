@@ -2,14 +2,17 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from distinfo import const
+from distinfo import Requirement, const
 from distinfo.distribution import Distribution
+from distinfo.requires import Requires
 
 from ..cases import Case
 
 if TYPE_CHECKING:
     import pytest
 
+    from distinfo.marker import Marker
+
 
 class TestDistribution(Case):
     async def test_str(self) -> None:
@@ -38,6 +41,45 @@ class TestDistribution(Case):
         await dist.add_requirements("aaa", "£$%")
         assert "aaa" not in dist.requires
 
+    async def test_add_requirements_incremental(self, dist: Distribution) -> None:
+        # duplicates across batches are merged by the index
+        for reqstr in ("a", "a>=1", "a<2", "b; python_version > '1'", "b>1"):
+            await dist.add_requirements("run", reqstr)
+        assert dist.requires.run == {"a<2,>=1", "b>1", "b; python_version > '1'"}
+        await dist.add_requirements("run", "b>2; python_version > '1'")
+        assert dist.requires.run == {"a<2,>=1", "b>1", "b>2; python_version > '1'"}
+        # sets assigned directly are indexed on next add
+        dist.requires.test = {Requirement.factory("c"), Requirement.factory("c>1")}
+        await dist.add_requirements("test", "c<2")
+        assert dist.requires.test == {"c<2,>1"}
+        # merge from a dirty collector
+        await dist.merge(dict(requires=dict(run=["a!=1.5"])))
+        assert dist.requires.run == {
+            "a!=1.5,<2,>=1",
+            "b>1",
+            "b>2; python_version > '1'",
+        }
+
+    async def test_add_requirements_shared(self, dist: Distribution) -> None:
+        # one requirement for two extras, merging for one leaves the other
+        await dist.update(dict(requires_dist=["a>1; extra == 'x' or extra == 'y'"]))
+        await dist.update(dict(requires_dist=["a<2; extra == 'x'"]))
+        assert dist.requires.x == {"a<2,>1"}
+        assert dist.requires.y == {"a>1"}
+        assert all(req in dist.requires.y for req in dist.requires.y)
+        # an extra's marker stripped leaves an empty marker, merged with no marker
+        await dist.add_requirements("x", "a!=1.5")
+        assert dist.requires.x == {"a!=1.5,<2,>1"}
+
+    async def test_requires_parse(self) -> None:
+        dist = await Distribution.factory(name="xxx")
+        reqs = dist.requires.parse(
+            "a", "£$%", "xxx", "xxx[b]", "b; python_version > '1'"
+        )
+        assert reqs == ["a", "xxx[b]", "b; python_version > '1'"]
+        dist.requires.add_reqstrs("run", "a>1", "a<2")
+        assert dist.requires.run == {"a<2,>1"}
+
     async def test_add_requirement_extra(self, dist: Distribution) -> None:
         await dist.add_requirements("", "aaa[bbb]")
         assert (await dist.requires.evaluate()).run == {"aaa[bbb]"}
@@ -52,6 +94,20 @@ class TestDistribution(Case):
         assert dist._excluded("bbb")
         assert not dist._excluded("readme")
 
+    async def test_filled(self) -> None:
+        dist = await Distribution.factory(
+            dict(name="a", license="b", keywords="c"), summary="d"
+        )
+        assert dist._filled("name")
+        assert dist._filled("summary")
+        assert not dist._filled("version")
+        # replaced by a preferred value
+        assert not dist._filled("license")
+        # accumulate
+        assert not dist._filled("keywords")
+        assert not dist._filled("requires")
+        assert not dist._filled("ext.xxx")
+
     async def test_update(self, caplog: pytest.LogCaptureFixture) -> None:
         dist = await Distribution.factory(
             dict(license="aa", metadata_version="1"),
@@ -151,7 +207,16 @@ class TestDistribution(Case):
         assert odict.name == "x"
         assert odict.requires.run == {"xxx"}
         assert odict.requires.dev == {"yyy", "zzz"}
+        assert all(isinstance(req, str) for req in odict.requires.run)
         assert odict.ext.x == 1
+        dist.ext.packages = {"a"}
+        odict = dist.to_dict()
+        assert odict.ext.packages == {"a"}
+        assert odict.ext.packages is not dist.ext.packages
+        dist.keywords.add("a")
+        odict = dist.to_dict()
+        assert odict.keywords == {"a"}
+        assert odict.keywords is not dist.keywords
         odict = dist.to_dict(core_metadata=True)
         assert odict.name == "x"
         assert odict.provides_extra == {"dev"}
@@ -164,3 +229,34 @@ class TestDistribution(Case):
         dist = await Distribution.factory(_exclude=("name",))
         odict = dist.to_dict()
         assert "name" not in odict
+
+    async def test_evaluate_matrix(
+        self, dist: Distribution, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        await dist.add_requirements(
+            "run",
+            "a; python_version < '3.11'",
+            "b",
+            "c; python_version >= '3.11'",
+            "d; python_version > '4'",
+            "f; python_version<'3.11'",
+        )
+        await dist.add_requirements("test", "e; python_version < '3.11'")
+        envs = [dict(python_version="3.10"), dict(python_version="3.12")]
+        marker_mask = Requires._marker_mask
+        masked = []
+
+        def _marker_mask(marker: Marker, envs: list[dict[str, str]]) -> int:
+            masked.append(marker)
+            return marker_mask(marker, envs)
+
+        monkeypatch.setattr(Requires, "_marker_mask", staticmethod(_marker_mask))
+        matrix = dist.requires.evaluate_matrix(envs)
+        assert matrix.run == dict(a=0b01, b=0b11, c=0b10, f=0b01)
+        # each distinct marker once
+        assert len(masked) == 3
+        assert matrix.test == dict(e=0b01)
+        assert list(dist.requires.evaluate_matrix(envs, "test")) == ["test"]
+        # raw requirements are used once evaluated
+        await dist.requires.evaluate()
+        assert dist.requires.evaluate_matrix(envs).run == matrix.run
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import anyio
+
+from distinfo.collector import FileIndex
+
+from ..cases import Case
+
+
+class TestFileIndex(Case):
+    async def test_has(self) -> None:
+        index = FileIndex()
+        results = {}
+
+        async def has(path: str) -> None:
+            results[path] = await index.has(path)
+
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(has, "a")
+            tg.start_soon(has, "b")
+            await anyio.wait_all_tasks_blocked()
+            assert not results
+            index.add("a", "c", "a")
+            await anyio.wait_all_tasks_blocked()
+            # known as soon as it is listed
+            assert results == dict(a=True)
+            assert str(index) == "2 files..."
+            # unknown until the listing is complete
+            index.close()
+        assert results == dict(a=True, b=False)
+        assert await index.wait() == ["a", "c"]
+        assert await index.has("c")
+        assert str(index) == "2 files"
+
+    async def test_from_files(self) -> None:
+        index = FileIndex.from_files(["a", "b"])
+        assert index.complete
+        assert await index.wait() == ["a", "b"]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import anyio
+import pytest
+from anyio.lowlevel import RunVar
+
+from distinfo import limits
+from distinfo.collector import DistCollector
+
+from ..cases import Case
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from py.path import local
+
+
+class TestLimits(Case):
+    @pytest.fixture(autouse=True)
+    def _cgroup(
+        self, monkeypatch: pytest.MonkeyPatch, tmpdir: local
+    ) -> Generator[None, None, None]:
+        monkeypatch.setattr(limits, "CGROUP", str(tmpdir))
+        monkeypatch.setattr(os, "sched_getaffinity", lambda _pid: set(range(8)))
+        monkeypatch.setattr(limits, "_limiters", RunVar("_limiters"))
+        monkeypatch.setattr(limits, "_totals", {})
+        limits.defaults.cache_clear()
+        yield
+        limits.defaults.cache_clear()
+
+    def test_no_cgroup(self) -> None:
+        assert limits.cpu_count() == 8
+        assert limits.memory_limit() is None
+        assert limits.defaults() == dict(subprocess=16, dirty=8, thread=12)
+
+    def test_cgroup_v2(self, tmpdir: local) -> None:
+        tmpdir.join("cpu.max").write("200000 100000\n")
+        tmpdir.join("memory.max").write(f"{limits.DIRTY_MEMORY * 3}\n")
+        assert limits.cpu_count() == 2
+        assert limits.defaults() == dict(subprocess=4, dirty=2, thread=6)
+        tmpdir.join("cpu.max").write("max 100000\n")
+        tmpdir.join("memory.max").write("max\n")
+        assert limits.cpu_count() == 8
+        assert limits.memory_limit() is None
+
+    def test_cgroup_v1(self, tmpdir: local) -> None:
+        tmpdir.mkdir("cpu").join("cpu.cfs_quota_us").write("50000\n")
+        tmpdir.join("cpu", "cpu.cfs_period_us").write("100000\n")
+        tmpdir.mkdir("memory").join("memory.limit_in_bytes").write(
+            f"{limits.DIRTY_MEMORY * 4}\n"
+        )
+        assert limits.cpu_count() == 1
+        assert limits.memory_limit() == limits.DIRTY_MEMORY * 4
+        tmpdir.join("cpu", "cpu.cfs_quota_us").write("-1\n")
+        tmpdir.join("memory", "memory.limit_in_bytes").write("9223372036854771712\n")
+        assert limits.cpu_count() == 8
+        assert limits.memory_limit() is None
+
+    async def test_configure(self) -> None:
+        limits.configure(dirty=3, thread=None)
+        assert limits.get("dirty").total_tokens == 3
+        assert limits.get("thread").total_tokens == 12
+        limits.configure(dirty=5)
+        assert limits.get("dirty").total_tokens == 5
+        assert await limits.run_sync(sum, (1, 2)) == 3
+        with pytest.raises(ValueError, match="unknown limit"):
+            limits.configure(xxx=1)
+        with pytest.raises(ValueError, match="at least 1"):
+            limits.configure(dirty=0)
+
+    def test_per_loop(self) -> None:
+        # configured outside of a loop
+        limits.configure(dirty=3)
+
+        async def get() -> anyio.CapacityLimiter:
+            return limits.get("dirty")
+
+        first = anyio.run(get)
+        second = anyio.run(get)
+        assert first is not second
+        assert first.total_tokens == second.total_tokens == 3
+
+    async def test_factory(self, tmpdir: local) -> None:
+        path = anyio.Path(tmpdir)
+        await DistCollector.factory(path, [], options=dict(max_dirty=3))
+        assert limits.get("dirty").total_tokens == 3
+        # not given so kept
+        await DistCollector.factory(path, [])
+        assert limits.get("dirty").total_tokens == 3
+        assert limits._totals == dict(dirty=3)
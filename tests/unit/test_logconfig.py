@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+from logging.handlers import BufferingHandler
+from typing import TYPE_CHECKING
+
+from distinfo import logconfig
+
+from ..cases import Case
+
+if TYPE_CHECKING:
+    import pytest
+
+
+class TestLogconfig(Case):
+    def _record(self, level: int) -> logging.LogRecord:
+        return logging.LogRecord("xxx", level, __file__, 0, "yyy", None, None)
+
+    def test_queue(self) -> None:
+        # conftest configures logging
+        assert isinstance(logconfig._handler, logconfig.BoundedQueueHandler)
+        assert logconfig._handler in logging.root.handlers
+        stream_handlers = logconfig._handler.listener.handlers
+        logconfig.shutdown()
+        assert logconfig._handler is None
+        assert all(handler in logging.root.handlers for handler in stream_handlers)
+        # idempotent
+        logconfig.shutdown()
+
+    def test_lossy(self, caplog: pytest.LogCaptureFixture) -> None:
+        target = BufferingHandler(capacity=100)
+        handler = logconfig.BoundedQueueHandler(
+            target, maxsize=1, drop_below=logging.INFO
+        )
+        handler.handle(self._record(logging.DEBUG))
+        # full
+        handler.handle(self._record(logging.DEBUG))
+        assert handler.dropped == 1
+        handler.listener.start()
+        handler.handle(self._record(logging.WARNING))
+        # shutdown flushes and reports drops
+        logconfig._handler = handler
+        logging.root.addHandler(handler)
+        logconfig.shutdown()
+        # the drop warning is logged to the restored handlers
+        assert [record.levelno for record in target.buffer] == [
+            logging.DEBUG,
+            logging.WARNING,
+            logging.WARNING,
+        ]
+        assert handler not in logging.root.handlers
+        assert "dropped 1 log records below info" in caplog.text
+        logging.root.removeHandler(target)
+
+    def test_format_in_listener(self) -> None:
+        formatted: list[str] = []
+
+        class Target(logging.Handler):
+            def emit(self, record: logging.LogRecord) -> None:
+                formatted.append(self.format(record))
+
+        class Thread:
+            def __str__(self) -> str:
+                return threading.current_thread().name
+
+        handler = logconfig.BoundedQueueHandler(Target())
+        handler.listener.start()
+        try:
+            raise ValueError("zzz")
+        except ValueError:
+            exc_info = sys.exc_info()
+        handler.handle(
+            logging.LogRecord(
+                "xxx", logging.INFO, __file__, 0, "%s", (Thread(),), exc_info
+            )
+        )
+        handler.listener.stop()
+        message, traceback = formatted[0].split("\n", 1)
+        assert message != threading.current_thread().name
+        assert traceback.startswith("Traceback")
+        assert traceback.endswith("ValueError: zzz")
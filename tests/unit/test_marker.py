@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from packaging.markers import Marker as PackagingMarker
+
+from distinfo.marker import Marker
+
+from ..cases import Case
+
+
+def marker(value: str) -> Marker:
+    return Marker.factory(PackagingMarker(value)._markers)
+
+
+class TestMarker(Case):
+    def test_normalize_flatten(self) -> None:
+        assert (
+            str(marker("os_name == 'a' and (python_version > '1' and os_name == 'b')"))
+            == 'os_name == "a" and os_name == "b" and python_version > "1"'
+        )
+
+    def test_normalize_dedupe(self) -> None:
+        assert str(marker("os_name == 'a' and os_name == 'a'")) == 'os_name == "a"'
+        assert str(marker("os_name == 'a' or os_name == 'a'")) == 'os_name == "a"'
+
+    def test_normalize_absorb(self) -> None:
+        assert (
+            str(marker("os_name == 'a' and (os_name == 'a' or os_name == 'b')"))
+            == 'os_name == "a"'
+        )
+        assert (
+            str(marker("os_name == 'a' or (os_name == 'a' and os_name == 'b')"))
+            == 'os_name == "a"'
+        )
+
+    def test_normalize_precedence(self) -> None:
+        value = marker("os_name == 'b' or os_name == 'a' and python_version > '1'")
+        assert (
+            str(value) == 'os_name == "b" or (os_name == "a" and python_version > "1")'
+        )
+        assert value.evaluate(dict(os_name="b", python_version="1"))
+        assert not value.evaluate(dict(os_name="a", python_version="1"))
+
+    def test_eq(self) -> None:
+        value = marker("os_name == 'a' and python_version > '1'")
+        value2 = marker("python_version > '1' and os_name == 'a'")
+        assert value == value2
+        assert hash(value) == hash(value2)
+        assert value == 'os_name == "a" and python_version > "1"'
+        assert value != marker("os_name == 'a'")
+        assert marker("extra == 'a' or extra == 'b'") == marker(
+            "extra == 'b' or extra == 'a'"
+        )
+
+    def test_iand(self) -> None:
+        value = marker("os_name == 'a' or os_name == 'b'")
+        value2 = marker("python_version > '1'")
+        for _ in range(3):
+            value &= value2
+            value &= marker("os_name == 'b' or os_name == 'a'")
+        assert (
+            str(value) == 'python_version > "1" and (os_name == "a" or os_name == "b")'
+        )
+        empty = marker("extra == 'x'")
+        empty &= value2
+        assert empty == marker("python_version > '1' and extra == 'x'")
+
+    def test_cached_str(self) -> None:
+        marker1 = marker("os_name == 'a' and extra == 'x'")
+        assert str(marker1) is str(marker1)
+        assert isinstance(marker1.extras, frozenset)
+        marker1 &= marker("os_name == 'b'")
+        assert str(marker1) == 'extra == "x" and os_name == "a" and os_name == "b"'
+        assert marker1 == marker("os_name == 'b' and os_name == 'a' and extra == 'x'")
+        assert hash(marker1) == hash(
+            marker("os_name == 'b' and os_name == 'a' and extra == 'x'")
+        )
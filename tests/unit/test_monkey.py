@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import logging
+import socket
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+from distinfo import monkey
+
+from ..cases import Case
+
+if TYPE_CHECKING:
+    from py.path import local
+
+
+class TestMonkey(Case):
+    def test_warmup(self) -> None:
+        monkey.warmup()
+        thread = monkey._warmup_thread
+        assert thread is not None
+        # once per process
+        monkey.warmup()
+        assert monkey._warmup_thread is thread
+        thread.join()
+        assert all(module in sys.modules for module in monkey.WARMUP_MODULES)
+
+    def test_deny_network(
+        self, tmpdir: local, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        caplog.set_level(logging.INFO)
+        with monkey.deny_network(logging.getLogger(__name__)):
+            with pytest.raises(monkey.NetworkDeniedError):
+                socket.getaddrinfo("example.org", 80)
+            with socket.socket() as sock, pytest.raises(monkey.NetworkDeniedError):
+                sock.connect(("127.0.0.1", 9))
+            with pytest.raises(monkey.NetworkDeniedError):
+                subprocess.run((sys.executable, "-m", "pip", "--version"), check=False)
+            # unix sockets and other processes are allowed
+            path = str(tmpdir.join("sock"))
+            with (
+                socket.socket(socket.AF_UNIX) as server,
+                socket.socket(socket.AF_UNIX) as client,
+            ):
+                server.bind(path)
+                server.listen()
+                client.connect(path)
+            subprocess.run(("true",), check=True)
+            subprocess.run((), executable="true", check=True)
+        assert caplog.messages == [
+            "denied network access: lookup of 'example.org', "
+            "connect to ('127.0.0.1', 9), "
+            f"running '{sys.executable} -m pip --version'"
+        ]
+        # allowed once done
+        assert socket.getaddrinfo("localhost", 80)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from distinfo import Requirement, protocol, worker
+from distinfo.distribution import Distribution
+
+from ..cases import Case
+
+
+class TestProtocol(Case):
+    def test_request(self) -> None:
+        request = protocol.Request(
+            path="/x",
+            files=["a.py", "b/c.py"],
+            collector="SetuptoolsMetadata",
+            options=dict(include=["name"]),
+            kwargs=dict(ext=dict(where={"src"})),
+            level=logging.DEBUG,
+        )
+        assert protocol.load_request(protocol.dump_request(request)) == request
+
+    @pytest.mark.parametrize(
+        "reqstr",
+        [
+            "a",
+            "a[x,y]>=1,<2",
+            "a @ http://example.org/a.tar.gz",
+            "a; os_name == 'posix' and (python_version > '1' or '2' < python_version)",
+            "a; extra == 'x'",
+        ],
+    )
+    async def test_result_requirement(self, reqstr: str) -> None:
+        req = Requirement.factory(reqstr)
+        dist = await Distribution.factory(name="x")
+        dist.requires.add_requirements("run", req)
+        _, _, requires, _ = protocol.load_result(protocol.dump_result(dist, True))
+        (decoded,) = requires["run"]
+        assert isinstance(decoded, Requirement)
+        assert decoded == req
+        assert str(decoded) == str(req)
+        assert decoded.marker == req.marker
+        assert decoded.specifier == req.specifier
+
+    async def test_result(self) -> None:
+        dist = await Distribution.factory(
+            name="x", keywords={"a", "b"}, ext=dict(packages={"p"}, n=dict(x=1))
+        )
+        result, fields, requires, records = protocol.load_result(
+            protocol.dump_result(dist, True, [(logging.INFO, "xxx", "a b")])
+        )
+        assert result is True
+        assert fields == dict(
+            name="x", keywords={"a", "b"}, ext=dict(packages={"p"}, n=dict(x=1))
+        )
+        assert requires == {}
+        assert records == [(logging.INFO, "xxx", "a b")]
+        # typed merge
+        dist2 = await Distribution.factory(keywords={"c"})
+        await dist2.merge(fields, typed=True)
+        assert dist2.keywords == {"a", "b", "c"}
+        assert dist2.ext.packages == {"p"}
+
+    def test_version(self) -> None:
+        data = protocol._pack([protocol.VERSION + 1, []])
+        with pytest.raises(protocol.ProtocolError):
+            protocol.load_request(data)
+
+    def test_ring_handler(self) -> None:
+        handler = worker.RingHandler(capacity=2)
+        logger = logging.getLogger("xxx")
+        logger.addHandler(handler)
+        try:
+            for i in range(3):
+                logger.warning("a %d", i)
+        finally:
+            logger.removeHandler(handler)
+        assert handler.records == [
+            (logging.WARNING, worker.__name__, "dropped 1 earlier log records"),
+            (logging.WARNING, "xxx", "a 1"),
+            (logging.WARNING, "xxx", "a 2"),
+        ]
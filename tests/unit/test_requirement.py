@@ -67,7 +67,11 @@ class TestRequirement(Case):
         assert str(req.marker) == marker
         marker2 = 'python_version < "2"'
         req &= Requirement.factory(f"aaa; {marker2}")
-        assert str(req.marker) == f"{marker} and {marker2}"
+        # normal form is sorted
+        assert str(req.marker) == f"{marker2} and {marker}"
+        # and does not grow on repeated merge
+        req &= Requirement.factory(f"aaa; {marker} and {marker2}")
+        assert str(req.marker) == f"{marker2} and {marker}"
         with pytest.raises(ValueError):
             req & Requirement.factory("bbb")
 
@@ -88,7 +92,9 @@ class TestRequirement(Case):
         assert str((req & req2).marker) == marker
         marker2 = 'python_version < "2"'
         req3 = Requirement.factory(f"aaa; {marker2}")
-        assert str((req2 & req3).marker) == f"{marker} and {marker2}"
+        assert str((req2 & req3).marker) == f"{marker2} and {marker}"
+        # operands are not modified
+        assert str(req2.marker) == marker
         with pytest.raises(ValueError):
             req & Requirement.factory("bbb")
 
@@ -139,3 +145,36 @@ class TestRequirement(Case):
             "x; os_name == 'posix' and python_version > '1' and extra == 'one-two'"
         )
         assert req == req2
+
+    def test_iand_specifier(self) -> None:
+        req = Requirement.factory("xxx>=1.0,<3")
+        for reqstr in ("xxx>=1.2", "xxx<2.5", "xxx>=1.0", "xxx!=3"):
+            req &= Requirement.factory(reqstr)
+        assert req == "xxx<2.5,>=1.2"
+
+    def test_cached_str(self) -> None:
+        req = Requirement.factory("xxx>=1; python_version > '1'")
+        assert str(req) is str(req)
+        hash_ = hash(req)
+        req &= Requirement.factory("xxx<2; python_version > '1'")
+        assert req == "xxx<2,>=1; python_version > '1'"
+        assert hash(req) != hash_
+        req.specifier &= Requirement.factory("xxx<1.5").specifier
+        assert req == "xxx<1.5,>=1; python_version > '1'"
+        assert req.replace(marker=None) == "xxx<1.5,>=1"
+        assert req == "xxx<1.5,>=1; python_version > '1'"
+
+    def test_cached_str_immutable(self) -> None:
+        req = Requirement.factory("xxx[a]; python_version > '1'")
+        assert str(req) == "xxx[a]; python_version > '1'"
+        # sets are frozen so can't change under the cache
+        assert isinstance(req.extras, frozenset)
+        with pytest.raises(AttributeError):
+            req.extras.add("b")  # type: ignore[attr-defined]
+        req.extras |= {"b"}
+        assert req == "xxx[a,b]; python_version > '1'"
+        # nor can the marker, `&=` rebinds
+        marker = req.marker
+        marker &= Requirement.factory("xxx; os_name == 'a'").marker
+        assert marker is not req.marker
+        assert req == "xxx[a,b]; python_version > '1'"
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import pytest
+from packaging.specifiers import SpecifierSet as _SpecifierSet
+
+from distinfo.specifier import SpecifierSet
+
+from ..cases import Case
+
+VERSIONS = [
+    f"{release}{suffix}"
+    for release in ("0.5", "0.9", "1", "1.0", "1.0.1", "1.1", "1.2", "1.5", "1.9")
+    + ("2", "2.0", "2.5", "3")
+    for suffix in ("", "a1", "a2", ".dev0", ".post1", ".post2")
+] + ["1.0+abc", "1.3a1"]
+
+
+class TestSpecifierSet(Case):
+    @pytest.mark.parametrize(
+        ("specifiers", "simplified"),
+        [
+            ("", ""),
+            (">=1.0,>=1.2,<3,<2.5", "<2.5,>=1.2"),
+            (">1,>=1", ">1"),
+            ("<=2,<2", "<2"),
+            (">=1,<=1", "==1"),
+            ("==1.0,>=1,!=2", "==1.0"),
+            ("==1.0,==1", "==1.0"),
+            (">=1,<2,!=0.5,!=1.5,!=3", "!=1.5,<2,>=1"),
+            ("~=1.1,>=1,>=1.2,!=1.*", "!=1.*,>=1.2,~=1.1"),
+            ("==1.0a1,>=0.9", "==1.0a1"),
+            # exclusive bounds also exclude post- and pre-releases of their release
+            (">1.0,>=1.0.post1", ">1.0,>=1.0.post1"),
+            (">1.0,>1.0.post1", ">1.0,>1.0.post1"),
+            (">1.0a1,>=1.0", ">1.0a1,>=1.0"),
+            (">1.0,>1.0a1,>=1.0.post1", ">1.0,>=1.0.post1"),
+            (">1.0.post1,>=1.0.post2", ">=1.0.post2"),
+            (">1.0,>=1.0.1", ">=1.0.1"),
+            ("<2.0,<=2.0a1", "<2.0,<=2.0a1"),
+            ("<2.0,<2.0a1", "<2.0,<2.0a1"),
+            ("<2.0a2,<=2.0a1", "<=2.0a1"),
+            ("<2.0,<=1.9", "<=1.9"),
+            # a dropped prerelease specifier still allows prereleases
+            (">=1.0a1,>=1.2", ">=1.2"),
+            # "==1.0" matches local versions
+            ("==1.0,==1.0+abc", "==1.0+abc"),
+            ("==1.0+abc,>=1", "==1.0+abc"),
+        ],
+    )
+    def test_simplify(self, specifiers: str, simplified: str) -> None:
+        specifier = SpecifierSet(specifiers)
+        assert specifier.satisfiable
+        assert str(specifier) == simplified
+        # the same versions match
+        original = _SpecifierSet(specifiers)
+        for version in VERSIONS:
+            assert specifier.contains(version, prereleases=True) == original.contains(
+                version, prereleases=True
+            ), version
+            # prereleases as the specifiers imply
+            assert specifier.contains(version) == original.contains(version), version
+
+    @pytest.mark.parametrize(
+        "specifiers",
+        [
+            ">2,<1",
+            ">1,<=1",
+            ">=1,<1",
+            "==1,==2",
+            "==1,!=1",
+            "==1,>1",
+            "==1,~=2.0",
+            ">1.0,>=1.0.post1,<=1.0.post1",
+            "==1.0+abc,==1.0+def",
+            "==1.0+abc,!=1.0",
+        ],
+    )
+    def test_unsatisfiable(self, specifiers: str) -> None:
+        specifier = SpecifierSet(specifiers)
+        assert not specifier.satisfiable
+        # unsimplified so the conflict is visible
+        assert specifier == specifiers
+
+    def test_and(self) -> None:
+        specifier = SpecifierSet(">=1.0,<3")
+        specifier &= SpecifierSet(">=1.2")
+        specifier &= "<2.5"
+        assert isinstance(specifier, SpecifierSet)
+        assert str(specifier) == "<2.5,>=1.2"
+        assert specifier.contains("2")
+        assert not specifier.contains("1.1")
+        specifier &= ">3"
+        assert not specifier.satisfiable
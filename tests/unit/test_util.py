@@ -7,7 +7,7 @@ import io
 import pytest
 from box import Box
 
-from distinfo import util
+from distinfo import Requirement, util
 
 from ..cases import Case
 
@@ -24,9 +24,15 @@ ODICT = dict(
     ten=[dict(a=1), {}],
 )
 
-ODICT_CLEAN = util.clean_dict(ODICT)
-
-ODICT_DUMP_CLEAN = util.dump_dict(ODICT_CLEAN, stringify=True)
+ODICT_DUMP_CLEAN = dict(
+    two=2,
+    three=dict(x=1),
+    four=False,
+    six=[1, 2],
+    seven=str(ODICT["seven"]),
+    eight=[9, 8],
+    ten=[dict(a=1)],
+)
 
 
 class TestUtil(Case):
@@ -55,6 +61,11 @@ class TestUtil(Case):
         odict = util.clean_dict(ODICT)
         self._assert_clean(odict)
 
+    def test_clean_dict_copy(self) -> None:
+        odict = dict(a=[dict(b=None), 1], c=Box(d=dict(e=1, f=None)))
+        assert util.clean_dict(odict) == dict(a=[1], c=dict(d=dict(e=1)))
+        assert odict == dict(a=[dict(b=None), 1], c=Box(d=dict(e=1, f=None)))
+
     def test_clean_dict_inplace(self) -> None:
         odict = copy.deepcopy(ODICT)
         util.clean_dict(odict, inplace=True)
@@ -66,9 +77,34 @@ class TestUtil(Case):
         assert isinstance(odict, Box)
         self._assert_clean(odict)
 
-    def test_dump_dict(self) -> None:
-        odict = util.dump_dict(ODICT)
-        assert odict["six"] == [1, 2]
+    def test_prepare(self) -> None:
+        assert (
+            util._prepare(ODICT, clean=True, sort=True, stringify=True)
+            == ODICT_DUMP_CLEAN
+        )
+        odict = util._prepare(
+            dict(a={"b", "A"}), clean=True, sort=False, stringify=True
+        )
+        assert set(odict["a"]) == {"A", "b"}
+        assert util._prepare(
+            dict(a=None), clean=False, sort=True, stringify=False
+        ) == dict(a=None)
+
+    def test_dumps_sort(self) -> None:
+        odict = dict(b=1, a={"d", "C"})
+        assert util.dumps(odict, fmt="json").startswith('{\n  "a": [\n    "C"')
+        assert util.dumps(odict, fmt="json", sort=False).startswith('{\n  "b": 1')
+        assert util.loads(util.dumps(odict, fmt="msgpack"), fmt="msgpack").keys() == {
+            "a",
+            "b",
+        }
+
+    def test_dumps_json_fast(self) -> None:
+        odict = dict(b={"x"}, a=Requirement.factory("xxx>=1"))
+        assert util.dumps(odict, fmt="json-fast") == '{"b":["x"],"a":"xxx>=1"}'
+        assert util.dumps(odict, fmt="json-fast", sort=True) == (
+            '{"a":"xxx>=1","b":["x"]}'
+        )
 
     def test_list_to_set(self) -> None:
         odict = dict(a=[1, dict(b=1)], b=dict(c=[1]))
@@ -79,7 +115,7 @@ class TestUtil(Case):
     def test_dump_load(self, fmt: str) -> None:
         check = ODICT_DUMP_CLEAN
         # dump/load
-        stream_cls = io.BytesIO if fmt == "msgpack" else io.StringIO
+        stream_cls = io.BytesIO if fmt in util.BINARY_FORMATS else io.StringIO
         stream = stream_cls()
         util.dump(ODICT, file=stream, fmt=fmt)
         stream.seek(0)
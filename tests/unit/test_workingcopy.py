@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+
+from distinfo import workingcopy
+
+from ..cases import Case
+
+if TYPE_CHECKING:
+    from py.path import local
+
+
+class TestWorkingCopy(Case):
+    @pytest.fixture()
+    def src(self, tmpdir: local) -> local:
+        src = tmpdir.join("src")
+        src.join("pkg", "__init__.py").write("", ensure=True)
+        src.join("setup.py").write("setup()")
+        src.join("setup.py").chmod(0o444)
+        src.join("__pycache__", "setup.cpython.pyc").write("", ensure=True)
+        src.join("link").mksymlinkto("setup.py")
+        return src
+
+    @pytest.mark.parametrize("strategy", ["hardlink", "copy"])
+    def test_materialise(self, tmpdir: local, src: local, strategy: str) -> None:
+        dst = tmpdir.join("dst")
+        assert workingcopy.materialise(str(src), str(dst), (strategy,)) == [strategy]
+        assert sorted(path.relto(dst) for path in dst.visit()) == [
+            "link",
+            "pkg",
+            os.path.join("pkg", "__init__.py"),
+            "setup.py",
+        ]
+        assert dst.join("link").readlink() == "setup.py"
+        assert dst.join("setup.py").read() == "setup()"
+        st = dst.join("setup.py").stat()
+        assert (st.nlink == 2) is (strategy == "hardlink")
+        if strategy == "copy":
+            assert st.mode & 0o777 == 0o644
+            assert st.mtime == src.join("setup.py").stat().mtime
+
+    def test_materialise_fallback(self, tmpdir: local, src: local) -> None:
+        dst = tmpdir.join("dst")
+        # reflink is unsupported on most test filesystems, hardlink is next
+        used = workingcopy.materialise(str(src), str(dst))
+        assert used in (["reflink"], ["hardlink"])
+
+    def test_copy_on_write(self, tmpdir: local, src: local) -> None:
+        dst = tmpdir.join("dst")
+        workingcopy.materialise(str(src), str(dst), ("hardlink",))
+        with workingcopy.copy_on_write(str(dst)):
+            with dst.join("setup.py").open("a") as stream:
+                stream.write(" # changed")
+            os.chmod(dst.join("pkg", "__init__.py"), 0o600)
+            # reading keeps the link
+            assert dst.join("link").read() == "setup() # changed"
+            assert dst.join("setup.py").stat().nlink == 1
+            assert dst.join("pkg", "__init__.py").stat().nlink == 1
+            src.join("pkg", "other.py").write("")
+            os.link(src.join("pkg", "other.py"), dst.join("pkg", "other.py"))
+            # subprocesses can't be followed so every link is replaced
+            subprocess.run(("true",), check=True)
+            assert dst.join("pkg", "other.py").stat().nlink == 1
+        assert src.join("setup.py").read() == "setup()"
+        assert src.join("setup.py").stat().mode & 0o777 == 0o444
+        assert src.join("pkg", "__init__.py").stat().mode & 0o777 == 0o644
+        assert not workingcopy._roots
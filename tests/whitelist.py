@@ -16,8 +16,10 @@ requires_external  # unused variable (distinfo/distribution.py:88)
 provides_dist  # unused variable (distinfo/distribution.py:92)
 obsoletes_dist  # unused variable (distinfo/distribution.py:94)
 _.handlers  # unused attribute (distinfo/logconfig.py:56)
-_.isatty  # unused attribute (distinfo/logconfig.py:59)
-_._startTime  # unused attribute (distinfo/logconfig.py:64)
+enqueue_sentinel  # unused method (distinfo/logconfig.py:28)
+enqueue  # unused method (distinfo/logconfig.py:53)
+_.isatty  # unused attribute (distinfo/logconfig.py:102)
+_._startTime  # unused attribute (distinfo/logconfig.py:109)
 _.warn  # unused attribute (distinfo/monkey.py:24)
 _.pinned  # unused property (distinfo/requirement.py:39)
 _logsetup  # unused function (tests/conftest.py:11)